@@ -1,34 +1,38 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import functools
+import hashlib
+import json
+import os
 import re
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from importlib.util import find_spec
 from pathlib import Path
-from pypdf import PdfReader
+
+from manual_align import PageFurniture, section_coverage
+from manual_catalog import (
+    CatalogError, add_selection_arguments, display_path, fraction, positive_int, select_from_args,
+)
+from manual_parser import load_manual
 
 BASE = Path(__file__).resolve().parent
 
-MANUALS = [
-    {
-        "model": "FT1001",
-        "original_pdf": "18V Cordless Drill manual new(FT1001)(1).pdf",
-        "rewritten_txt": "FT1001_Drill_Manual_REWRITTEN.txt",
-    },
-    {
-        "model": "FT1002",
-        "original_pdf": "18V cordless oscillating tool manual  new(FT1002)(1).pdf",
-        "rewritten_txt": "FT1002_OscillatingTool_Manual_REWRITTEN.txt",
-    },
-    {
-        "model": "FT1003",
-        "original_pdf": "18V Cordless Mini Saw manual new(FT1003)(1).pdf",
-        "rewritten_txt": "FT1003_MiniSaw_Manual_REWRITTEN.txt",
-    },
-    {
-        "model": "FT1004",
-        "original_pdf": "18V Cordless Rotary tool manual new(FT1004).pdf",
-        "rewritten_txt": "FT1004_RotaryTool_Manual_REWRITTEN.txt",
-    },
-]
+# Persistent per-PDF extraction cache (extracted text of every page)
+TEXT_CACHE_DIR = BASE / ".audit_cache"
+# Bump when the cached page format changes
+TEXT_CACHE_VERSION = 4
+# Smaller PDFs are not worth a process pool
+MIN_PAGES_PER_JOB = 4
+# Pages per task of a parallel extraction. Tasks finish in any order but are
+# read in page order, so smaller tasks hold fewer pages waiting in memory.
+MAX_PAGES_PER_TASK = 16
+# Original sections with fewer shingles are too short to flag for low coverage
+MIN_SECTION_SHINGLES = 10
 
 # Keywords to check. We only flag a keyword if it's present in the ORIGINAL but missing in the REWRITE.
 KEYWORDS = [
@@ -81,52 +85,677 @@ KEYWORDS = [
 ]
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def normalize(s: str) -> str:
     s = s.lower()
     s = s.replace("\u2013", "-").replace("\u2014", "-")
-    s = re.sub(r"\s+", " ", s)
+    s = _WHITESPACE_RE.sub(" ", s)
     return s
 
 
+def iter_normalized(chunks: Iterable[str]) -> Iterator[str]:
+    """normalize() applied to a stream of text pieces, one piece at a time.
+
+    Joining the output gives normalize("".join(chunks)): a whitespace run
+    that straddles two pieces still collapses to a single space.
+    """
+    after_space = False
+    for chunk in chunks:
+        chunk = normalize(chunk)
+        if after_space and chunk.startswith(" "):
+            chunk = chunk[1:]
+        if chunk:
+            after_space = chunk.endswith(" ")
+            yield chunk
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """One-pass multi-keyword matcher (Aho-Corasick automaton).
+
+    Keywords are normalized once when the automaton is built; scan() then
+    walks a normalized text a single time and reports the start offset of
+    every occurrence of every keyword. With word_boundary=True a match only
+    counts if it is not glued to a letter/digit on a side where the keyword
+    itself starts or ends with one (a regex-style word boundary); otherwise
+    matching is plain substring matching, as with `keyword in text`.
+    """
+
+    def __init__(self, keywords: list[str], word_boundary: bool = False):
+        self.keywords = list(keywords)
+        self.word_boundary = word_boundary
+        self.patterns = [normalize(kw) for kw in self.keywords]
+
+        # goto[state] maps a character to the next state; out[state] lists the
+        # keyword indexes that end at that state (including via fail links).
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for idx, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(idx)
+
+        fail = [0] * len(goto)
+        # Breadth-first, so fail links always point at already finished states;
+        # depth-1 states fail to the root.
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def scanner(self) -> KeywordScanner:
+        """A fresh incremental scan over this automaton."""
+        return KeywordScanner(self)
+
+    def scan(self, text: str) -> dict[str, list[int]]:
+        """Map every keyword to the start offsets of its matches in text."""
+        scanner = self.scanner()
+        scanner.feed(text)
+        return scanner.close()
+
+
+class KeywordScanner:
+    """Incremental KeywordMatcher scan over text fed in pieces.
+
+    The automaton state and the last few characters are carried from one
+    feed() to the next, so matches spanning piece boundaries are found and
+    offsets are relative to the whole stream. Only one piece plus a tail of
+    the longest keyword's length is held at a time.
+    """
+
+    def __init__(self, matcher: KeywordMatcher):
+        self.matcher = matcher
+        self.hits: dict[str, list[int]] = {kw: [] for kw in matcher.keywords}
+        self._state = 0
+        self._offset = 0
+        self._tail = ""
+        self._keep = max((len(p) for p in matcher.patterns), default=0)
+        # Word-boundary matches ending on a piece's last character wait here
+        # until the next character is known.
+        self._pending: list[tuple[int, int]] = []
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        m = self.matcher
+        goto, fail, out = m._goto, m._fail, m._out
+        keywords, patterns = m.keywords, m.patterns
+        word_boundary = m.word_boundary
+        hits = self.hits
+
+        if self._pending:
+            nxt_is_word = _is_word_char(chunk[0])
+            for idx, start in self._pending:
+                if not (nxt_is_word and _is_word_char(patterns[idx][-1])):
+                    hits[keywords[idx]].append(start)
+            self._pending = []
+
+        tail = self._tail
+        buf = tail + chunk
+        base = self._offset - len(tail)  # stream offset of buf[0]
+        last = len(buf) - 1
+        state = self._state
+        for i, ch in enumerate(chunk, len(tail)):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for idx in out[state]:
+                pattern = patterns[idx]
+                start = i - len(pattern) + 1
+                if word_boundary:
+                    if start + base > 0 and _is_word_char(pattern[0]) and _is_word_char(buf[start - 1]):
+                        continue
+                    if i == last:
+                        self._pending.append((idx, base + start))
+                        continue
+                    if _is_word_char(pattern[-1]) and _is_word_char(buf[i + 1]):
+                        continue
+                hits[keywords[idx]].append(base + start)
+
+        self._state = state
+        self._offset += len(chunk)
+        self._tail = buf[-self._keep:] if self._keep else ""
+
+    def close(self) -> dict[str, list[int]]:
+        """Finish the stream and return {keyword: start offsets}."""
+        for idx, start in self._pending:
+            self.hits[self.matcher.keywords[idx]].append(start)
+        self._pending = []
+        return self.hits
+
+
+@functools.lru_cache(maxsize=None)
+def keyword_matcher(word_boundary: bool = False) -> KeywordMatcher:
+    """The matcher for KEYWORDS, built once per process."""
+    return KeywordMatcher(KEYWORDS, word_boundary=word_boundary)
+
+
+def _extract_pages(reader, start: int, stop: int) -> Iterator[tuple[int, str, str | None]]:
+    for i in range(start, stop):
+        try:
+            yield i, reader.pages[i].extract_text() or "", None
+        except Exception as e:
+            yield i, "", f"{type(e).__name__}: {e}"
+
+
+def _extract_page_range(job: tuple[str, int, int]) -> list[tuple[int, str, str | None]]:
+    """Extract pages [start, stop) of one PDF; runs in a worker process."""
+    from pypdf import PdfReader
+
+    path, start, stop = job
+    return list(_extract_pages(PdfReader(path), start, stop))
+
+
+def iter_pdf_pages(
+    path: Path, max_pages: int | None = None, jobs: int = 1
+) -> Iterator[tuple[int, str, str | None]]:
+    """(page index, raw text, error or None) of each page, in page order.
+
+    Pages are yielded as they are extracted. With jobs > 1 the pages are
+    split into ranges of at most MAX_PAGES_PER_TASK that are extracted in a
+    process pool; only ranges finished ahead of the one being read are held.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(path))
+    n = len(reader.pages)
+    if max_pages:
+        n = min(n, max_pages)
+
+    jobs = max(1, min(jobs, n // MIN_PAGES_PER_JOB))
+    if jobs == 1:
+        yield from _extract_pages(reader, 0, n)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    step = min(-(-n // jobs), MAX_PAGES_PER_TASK)
+    ranges = [(str(path), start, min(start + step, n)) for start in range(0, n, step)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for chunk in pool.map(_extract_page_range, ranges):
+            yield from chunk
+
+
+def extract_pdf_pages(
+    path: Path, max_pages: int | None = None, jobs: int = 1
+) -> tuple[list[str], dict[int, str]]:
+    """Raw text of each page, plus {page index: error} for pages that failed."""
+    pages = []
+    failed = {}
+    for i, text, error in iter_pdf_pages(path, max_pages, jobs):
+        pages.append(text)
+        if error is not None:
+            failed[i] = error
+    return pages, failed
+
+
 def extract_pdf_text(path: Path, max_pages: int | None = None) -> str:
-    r = PdfReader(str(path))
-    pages = r.pages[:max_pages] if max_pages else r.pages
-    out = []
-    for p in pages:
+    return "\n".join(extract_pdf_pages(path, max_pages)[0])
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _text_cache_file(path: Path) -> Path:
+    key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:32]
+    return TEXT_CACHE_DIR / f"{key}.jsonl"
+
+
+@functools.lru_cache(maxsize=None)
+def _pypdf_version() -> str:
+    """pypdf's version, read from its source so that cache hits never import it.
+
+    Importing pypdf or importlib.metadata would dominate the start-up of an
+    audit that is answered entirely from the extraction cache.
+    """
+    spec = find_spec("pypdf")
+    if spec is not None and spec.origin:
+        try:
+            source = Path(spec.origin).with_name("_version.py").read_text(encoding="utf-8")
+        except OSError:
+            source = ""
+        m = re.search(r"__version__\s*=\s*[\"']([^\"']+)", source)
+        if m:
+            return m.group(1)
+    from importlib import metadata
+
+    return metadata.version("pypdf")
+
+
+def _extractor_version() -> str:
+    # Different pypdf releases extract text differently
+    return f"{TEXT_CACHE_VERSION}:pypdf-{_pypdf_version()}"
+
+
+# Cache files are JSON Lines: a header object, then one JSON string per page,
+# so a cache hit can be streamed page by page.
+def _read_cache_header(cache_file: Path) -> dict | None:
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def _iter_cache_pages(cache_file: Path) -> Iterator[str]:
+    with open(cache_file, "r", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            yield json.loads(line)
+
+
+def _write_cache(cache_file: Path, header: dict, pages: Iterable[str]) -> None:
+    """Write a cache entry. Failing to write the cache is not an error."""
+    tmp = cache_file.with_suffix(".tmp")
+    try:
+        TEXT_CACHE_DIR.mkdir(exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for page in pages:
+                f.write(json.dumps(page, ensure_ascii=False) + "\n")
+        os.replace(tmp, cache_file)
+    except OSError:
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def _open_staging(staged: Path):
+    """The staging file for a cache entry, or None if it cannot be written."""
+    try:
+        TEXT_CACHE_DIR.mkdir(exist_ok=True)
+        f = open(staged, "w", encoding="utf-8")
+    except OSError:
+        return None
+    try:
+        # Same layout as a cache file, with a placeholder header
+        f.write("{}\n")
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def _extract_to_cache(
+    path: Path, jobs: int, cache_file: Path | None, header: dict, failed: dict[int, str]
+) -> Iterator[str]:
+    """Yield each page as it is extracted, adding failures to failed.
+
+    With a cache_file, each page is also staged on disk as it is yielded, and
+    the cache entry is written once the last page is out. A stream that is
+    not read to the end leaves the cache as it was. If the cache cannot be
+    written (a read-only checkout, a full disk) the pages are still yielded;
+    only the cache entry is missing.
+    """
+    staged = None if cache_file is None else cache_file.with_suffix(".pages.tmp")
+    f = None if staged is None else _open_staging(staged)
+    try:
+        page_count = 0
+        for i, text, error in iter_pdf_pages(path, jobs=jobs):
+            if error is not None:
+                failed[i] = error
+            if f is not None:
+                try:
+                    f.write(json.dumps(text, ensure_ascii=False) + "\n")
+                except OSError:
+                    f.close()
+                    f = None
+            page_count += 1
+            yield text
+        if f is not None:
+            f.close()
+            f = None
+            header.update(page_count=page_count, failed={str(i): e for i, e in failed.items()})
+            _write_cache(cache_file, header, _iter_cache_pages(staged))
+    finally:
+        if f is not None:
+            f.close()
+        if staged is not None:
+            try:
+                staged.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+def stream_pdf_pages(
+    path: Path, use_cache: bool = True, jobs: int = 1, raw: bool = False
+) -> tuple[Iterator[str], dict[int, str]]:
+    """Normalized text of every page of a PDF, cached on disk.
+
+    Returns an iterator over the pages and {page index: error} for pages that
+    could not be extracted (their text is empty). On a cache hit the pages are
+    read lazily, one line of the cache file at a time. On a miss they are
+    extracted as they are read and written to the cache as they go; the
+    error dict is then complete once the iterator is exhausted. Either way no
+    more than a page is held at a time. The cache holds the text as
+    extracted; with raw=True it is returned that way, line breaks and all,
+    instead of normalized.
+
+    A cache entry is reused without hashing when the file's size and mtime are
+    unchanged. If only the stat data changed, the content hash decides: a
+    touched-but-identical file keeps its entry, a replaced file is re-extracted.
+    """
+    path = Path(path)
+    st = path.stat()
+    cache_file = _text_cache_file(path)
+    version = _extractor_version()
+
+    header = _read_cache_header(cache_file) if use_cache else None
+    if header is not None and (header.get("version") != version or header.get("path") != str(path)):
+        header = None
+
+    finish = (lambda pages: pages) if raw else _iter_normalized_pages
+    if header is not None and header["size"] == st.st_size and header["mtime_ns"] == st.st_mtime_ns:
+        return finish(_iter_cache_pages(cache_file)), {int(i): e for i, e in header["failed"].items()}
+
+    digest = file_sha256(path)
+    if header is not None and header["sha256"] == digest:
+        # Touched but unchanged: refresh the stat data and keep the pages
+        header.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        _write_cache(cache_file, header, _iter_cache_pages(cache_file))
+        return finish(_iter_cache_pages(cache_file)), {int(i): e for i, e in header["failed"].items()}
+
+    header = {
+        "version": version,
+        "path": str(path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest,
+    }
+    failed: dict[int, str] = {}
+    pages = _extract_to_cache(path, jobs, cache_file if use_cache else None, header, failed)
+    return finish(pages), failed
+
+
+def _iter_normalized_pages(pages: Iterable[str]) -> Iterator[str]:
+    for page in pages:
+        yield normalize(page).strip()
+
+
+def cached_pdf_pages(
+    path: Path, use_cache: bool = True, jobs: int = 1, raw: bool = False
+) -> tuple[list[str], dict[int, str]]:
+    """stream_pdf_pages() with the pages collected into a list."""
+    pages, failed = stream_pdf_pages(path, use_cache=use_cache, jobs=jobs, raw=raw)
+    return list(pages), failed
+
+
+def _timed(items: Iterable, totals: dict[str, float], key: str) -> Iterator:
+    """Yield from items, adding the time spent producing them to totals[key]."""
+    it = iter(items)
+    while True:
+        start = time.perf_counter()
         try:
-            t = p.extract_text() or ""
-        except Exception:
-            t = ""
-        out.append(t)
-    return "\n".join(out)
+            item = next(it)
+        except StopIteration:
+            totals[key] += time.perf_counter() - start
+            return
+        totals[key] += time.perf_counter() - start
+        yield item
+
+
+def audit_manual(
+    m: dict, extract_jobs: int = 1, coverage: bool = False,
+    min_coverage: float | None = None, shingle_size: int = 1, word_boundary: bool = False,
+) -> dict:
+    """Audit one catalog manual and return a JSON-serializable result.
 
+    The original_pdf is compared against the full_text_file, read as it is
+    written. extract_seconds covers PDF extraction (or reading its cache) and,
+    with coverage, loading the rewrite's parsed tree; match_seconds is the
+    rest of the run, i.e. the keyword scans.
+    Exceptions are reported in the "error" field.
 
-def check_manual(m: dict) -> None:
-    orig_path = BASE / m["original_pdf"]
-    rew_path = BASE / m["rewritten_txt"]
+    "hits" maps every keyword to its match counts and the start offsets of
+    its matches in each normalized text (original_offsets, rewritten_offsets).
+    With word_boundary a keyword glued to a letter or digit does not count
+    (see KeywordMatcher), so "CE" no longer matches inside "device".
 
-    orig_text = normalize(extract_pdf_text(orig_path))
-    rew_text = normalize(rew_path.read_text(encoding="utf-8"))
+    With coverage (or a min_coverage), the original is also split into
+    sections and aligned with the rewrite (see manual_align): "sections" holds
+    each section's coverage, "low_coverage" the titles of sections of at least
+    MIN_SECTION_SHINGLES shingles covered less than min_coverage, and
+    align_seconds the time it took.
+    """
+    coverage = coverage or min_coverage is not None
+    orig_path = Path(m["original_pdf"])
+    rew_path = Path(m["full_text_file"])
+    result = {
+        "model": m["model"],
+        "original_pdf": display_path(m["original_pdf"]),
+        "rewritten_txt": display_path(m["full_text_file"]),
+        "error": None,
+    }
+    totals = {"extract": 0.0, "align": 0.0}
+    start = time.perf_counter()
+    try:
+        matcher = keyword_matcher(word_boundary)
 
-    missing = []
-    for kw in KEYWORDS:
-        nkw = normalize(kw)
-        if nkw in orig_text and nkw not in rew_text:
-            missing.append(kw)
+        # Scan the original page by page; the stream is normalize(extract_pdf_text(...))
+        # minus outer whitespace, but never held in memory as one string.
+        t0 = time.perf_counter()
+        pages, failed_pages = stream_pdf_pages(orig_path, jobs=extract_jobs, raw=coverage)
+        totals["extract"] += time.perf_counter() - t0
+        orig_scan = matcher.scanner()
+        page_count = 0
+        sep = ""
+        # Section splitting needs the line breaks, which normalize() removes.
+        # Its page furniture is counted on this pass; the sections are split
+        # on a second one, read back from the extraction cache (or extracted
+        # again when the cache could not be written).
+        furniture = PageFurniture() if coverage else None
+        for page in _timed(pages, totals, "extract"):
+            page_count += 1
+            if furniture is not None:
+                furniture.add(page)
+                page = normalize(page).strip()
+            if page:
+                orig_scan.feed(sep)
+                orig_scan.feed(page)
+                sep = " "
+        orig_hits = orig_scan.close()
 
+        # The rewrite is scanned as written, line by line: headers, rules and
+        # label colons included, as they are not all kept in the parsed tree.
+        rew_scan = matcher.scanner()
+        with rew_path.open(encoding="utf-8") as f:
+            for chunk in iter_normalized(f):
+                rew_scan.feed(chunk)
+        rew_hits = rew_scan.close()
+
+        sections = None
+        if coverage:
+            t0 = time.perf_counter()
+            tree = load_manual(rew_path)
+            pages, _ = stream_pdf_pages(orig_path, jobs=extract_jobs, raw=True)
+            totals["extract"] += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            extracted = totals["extract"]
+            sections = section_coverage(_timed(pages, totals, "extract"), tree, shingle_size,
+                                        furniture.lines())
+            totals["align"] += time.perf_counter() - t0 - (totals["extract"] - extracted)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    elapsed = time.perf_counter() - start
+    result.update(
+        page_count=page_count,
+        failed_pages={str(i + 1): error for i, error in sorted(failed_pages.items())},
+        missing=[kw for kw in KEYWORDS if orig_hits[kw] and not rew_hits[kw]],
+        hits={
+            kw: {
+                "original": len(orig_hits[kw]),
+                "rewritten": len(rew_hits[kw]),
+                "original_offsets": orig_hits[kw],
+                "rewritten_offsets": rew_hits[kw],
+            }
+            for kw in KEYWORDS
+        },
+        extract_seconds=round(totals["extract"], 4),
+        match_seconds=round(elapsed - totals["extract"] - totals["align"], 4),
+    )
+    if sections is not None:
+        result.update(
+            sections=[
+                dict(s._asdict(), coverage=round(s.coverage, 4),
+                     match_share=None if s.match_share is None else round(s.match_share, 4))
+                for s in sections
+            ],
+            low_coverage=[
+                s.title for s in sections
+                if min_coverage is not None and s.shingles >= MIN_SECTION_SHINGLES
+                and s.coverage < min_coverage
+            ],
+            align_seconds=round(totals["align"], 4),
+        )
+    return result
+
+
+def print_report(result: dict) -> None:
     print("=" * 72)
-    print(f"{m['model']} audit")
-    print(f"  original:  {m['original_pdf']}")
-    print(f"  rewritten: {m['rewritten_txt']}")
-    print(f"  flagged missing keywords (present in original, absent in rewrite): {len(missing)}")
-    for kw in missing:
+    print(f"{result['model']} audit")
+    print(f"  original:  {result['original_pdf']}")
+    print(f"  rewritten: {result['rewritten_txt']}")
+    if result["error"]:
+        print(f"  error: {result['error']}")
+        return
+    failed_pages = result["failed_pages"]
+    if failed_pages:
+        print(f"  original pages that failed to extract: {len(failed_pages)} of {result['page_count']}")
+        for page, error in failed_pages.items():
+            print(f"   - page {page}: {error}")
+    print(f"  flagged missing keywords (present in original, absent in rewrite): {len(result['missing'])}")
+    for kw in result["missing"]:
         print(f"   - {kw}")
+    if "sections" in result:
+        low = set(result["low_coverage"])
+        print(f"  section coverage (original section -> closest rewrite section): "
+              f"{len(low)} below the minimum")
+        for s in result["sections"]:
+            mark = "✗" if s["title"] in low else " "
+            match = s["match"] or "-"
+            print(f"   {mark} p{s['page']:<3} {s['coverage']:4.0%}  {s['title']}  ->  {match}")
+            if s["title"] in low and s["missing"]:
+                print(f"       not in rewrite: {', '.join(s['missing'])}")
+
+
+def check_manual(m: dict, extract_jobs: int = 1, coverage: bool = False) -> None:
+    print_report(audit_manual(m, extract_jobs=extract_jobs, coverage=coverage))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit rewritten manuals against the original PDFs.")
+    parser.add_argument(
+        "-j", "--jobs", type=positive_int, nargs="?", default=1, const=None,
+        help="manuals audited concurrently in worker processes (default: 1; -j alone: one per CPU core)",
+    )
+    parser.add_argument(
+        "--extract-jobs", type=positive_int, nargs="?", default=1, const=None, metavar="N",
+        help="worker processes for PDF text extraction on a cache miss "
+             "(default: 1; --extract-jobs alone: one per CPU core)",
+    )
+    parser.add_argument(
+        "--format", choices=("text", "json", "jsonl"), default="text",
+        help="report format (json/jsonl are machine-readable, one record per manual)",
+    )
+    parser.add_argument(
+        "--coverage", action="store_true",
+        help="also align the original's sections with the rewrite and report how much of each is covered",
+    )
+    parser.add_argument(
+        "--min-coverage", type=fraction, metavar="FRACTION",
+        help="flag original sections covered less than this (0-1); implies --coverage",
+    )
+    parser.add_argument(
+        "--shingle-size", type=positive_int, default=1, metavar="N",
+        help="content terms per shingle for --coverage (1 = vocabulary, 2+ = wording; default: 1)",
+    )
+    parser.add_argument(
+        "--word-boundary", action="store_true",
+        help="only count keywords that stand as whole words (\"CE\" not inside \"device\")",
+    )
+    add_selection_arguments(parser)
+    args = parser.parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
+    extract_jobs = args.extract_jobs or os.cpu_count() or 1
+
+    try:
+        _, selected = select_from_args(args)
+    except CatalogError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+    if not selected:
+        print("No manuals selected.", file=sys.stderr)
+        return 2 if args.model else 0
+    # Manuals written from scratch have no supplier original to compare against
+    manuals = [m for m in selected if m.get("original_pdf")]
+    for m in selected:
+        if not m.get("original_pdf"):
+            print(f"{m['model']}: no original PDF in the catalog, not audited", file=sys.stderr)
+
+    if jobs > 1 and len(manuals) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(manuals))) as pool:
+            n = len(manuals)
+            results = list(pool.map(audit_manual, manuals, [extract_jobs] * n, [args.coverage] * n,
+                                    [args.min_coverage] * n, [args.shingle_size] * n,
+                                    [args.word_boundary] * n))
+    else:
+        results = [audit_manual(m, extract_jobs, args.coverage, args.min_coverage, args.shingle_size,
+                                args.word_boundary)
+                   for m in manuals]
 
+    if args.format == "json":
+        print(json.dumps(results, indent=2, sort_keys=True, ensure_ascii=False))
+    elif args.format == "jsonl":
+        for result in results:
+            print(json.dumps(result, sort_keys=True, ensure_ascii=False))
+    else:
+        for result in results:
+            print_report(result)
 
-def main():
-    for m in MANUALS:
-        check_manual(m)
+    # 2: a manual could not be audited; 1: keywords missing from a rewrite or
+    # an original section below --min-coverage
+    if any(r["error"] for r in results):
+        return 2
+    if any(r["missing"] or r.get("low_coverage") for r in results):
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for parsing, laying out and rendering manuals.
+
+Every case is timed stage by stage:
+
+    read    reading and decoding the source text
+    parse   tokenizing it into a ManualNode tree (no AST cache)
+    story   turning the tree into flowables (cover page + add_manual), with
+            the inline markup cache (manual_inline) cleared first
+    layout  doc.build() flowing the story onto pages
+    save    NumberedCanvas.save(): page-number patching and PDF serialization
+
+plus, for comparison, the time of a layout-only FreedomManualPDF.dry_run()
+of a fresh copy of the story (dry_run_seconds), and of the inline markup
+stage alone over every block (inline_seconds, uncached; part of story).
+Neither is counted in the total.
+
+The cases are the manuals of the catalog plus synthetic manuals made by
+repeating one of them 10x and 100x. Each stage reports its best time over
+--repeat runs; peak memory comes from one further run under tracemalloc so
+that tracing does not distort the timings.
+
+    python3 bench_manuals.py --json bench.json
+    python3 bench_manuals.py --scales 10 --compare bench.json
+
+Results are JSON (with the git commit they were measured at), and --compare
+reports the change against an earlier results file; the exit status is 1 if
+any case got slower than --threshold.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import reportlab
+
+from manual_catalog import load_catalog, positive_int
+from manual_inline import inline_markup
+from manual_parser import parse_manual
+from manual_pdf import FreedomManualPDF, NumberedCanvas
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+STAGES = ('read', 'parse', 'story', 'layout', 'save')
+DEFAULT_SCALES = (10, 100)
+
+
+class TimedCanvas(NumberedCanvas):
+    """NumberedCanvas that records how long save() takes and the page count."""
+
+    # Figures of the most recent save(); the benchmark runs one build at a time
+    last = {}
+
+    def save(self):
+        start = time.perf_counter()
+        NumberedCanvas.save(self)
+        TimedCanvas.last = {'save': time.perf_counter() - start, 'pages': self._pageNumber - 1}
+
+
+class TimedManualPDF(FreedomManualPDF):
+    canvas_class = TimedCanvas
+
+
+def run_case(path, model, title, layout_mode):
+    """Run every stage once for one source file; returns timings in seconds."""
+    bench = {}
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    bench['read'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree = parse_manual(text)
+    bench['parse'] = time.perf_counter() - start
+
+    inline_markup.cache_clear()
+    start = time.perf_counter()
+    pdf = TimedManualPDF(None, model, title)
+    pdf.layout_mode = layout_mode
+    pdf.add_cover_page(title, model)
+    pdf.add_manual(tree)
+    bench['story'] = time.perf_counter() - start
+
+    # The stage's own work, without the cache that repeated lines would hit
+    markup = inline_markup.__wrapped__
+    blocks = [(node.text, node.kind) for node in tree.walk()]
+    start = time.perf_counter()
+    for block, kind in blocks:
+        markup(block, kind)
+    bench['inline'] = time.perf_counter() - start
+
+    out = io.BytesIO()
+    start = time.perf_counter()
+    pdf.build(out)
+    bench.update(TimedCanvas.last)
+    bench['layout'] = time.perf_counter() - start - bench['save']
+
+    # A fresh story, so the dry run cannot reuse line breaks from the build
+    pdf = TimedManualPDF(None, model, title)
+    pdf.layout_mode = layout_mode
+    pdf.add_cover_page(title, model)
+    pdf.add_manual(tree)
+    start = time.perf_counter()
+    pdf.dry_run()
+    bench['dry_run'] = time.perf_counter() - start
+
+    bench['lines'] = text.count('\n') + 1
+    bench['bytes'] = len(out.getvalue())
+    return bench
+
+
+def peak_memory(path, model, title, layout_mode):
+    """Peak traced allocation, in bytes, of one full run of a case."""
+    tracemalloc.start()
+    try:
+        run_case(path, model, title, layout_mode)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name, path, model, title, layout_mode, repeat):
+    runs = [run_case(path, model, title, layout_mode) for _ in range(repeat)]
+    stages = {stage: min(run[stage] for run in runs) for stage in STAGES}
+    total = sum(stages.values())
+    lines, pages = runs[0]['lines'], runs[0]['pages']
+    render = stages['layout'] + stages['save']
+    return {
+        'name': name,
+        'source': os.path.relpath(path, BASE) if path.startswith(BASE) else os.path.basename(path),
+        'lines': lines,
+        'pages': pages,
+        'pdf_bytes': runs[0]['bytes'],
+        'seconds': stages,
+        'total_seconds': total,
+        'dry_run_seconds': min(run['dry_run'] for run in runs),
+        'inline_seconds': min(run['inline'] for run in runs),
+        'lines_per_sec': lines / total if total else 0.0,
+        'pages_per_sec': pages / render if render else 0.0,
+        'peak_memory_mb': peak_memory(path, model, title, layout_mode) / (1024 * 1024),
+    }
+
+
+def catalog_cases(layout_mode):
+    key = 'full_text_file' if layout_mode == 'full' else 'text_file'
+    for manual in load_catalog():
+        yield manual['model'], manual[key], manual['model'], manual['title']
+
+
+def synthetic_source(path, scale, directory):
+    """Write a manual that is the given source repeated scale times."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    name = f"{os.path.splitext(os.path.basename(path))[0]}_x{scale}.txt"
+    synthetic = os.path.join(directory, name)
+    with open(synthetic, 'w', encoding='utf-8') as f:
+        f.write('\n'.join([text.rstrip('\n')] * scale) + '\n')
+    return synthetic
+
+
+def git_commit():
+    try:
+        proc = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE,
+                              capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def run(layout_mode='condensed', scales=DEFAULT_SCALES, repeat=3, progress=None):
+    results = []
+    cases = list(catalog_cases(layout_mode))
+    with tempfile.TemporaryDirectory() as tmp:
+        model, base_path, _, title = cases[0]
+        for scale in scales:
+            path = synthetic_source(base_path, scale, tmp)
+            cases.append((f"{model} x{scale}", path, model, title))
+        # Pay the one-off style, font and import set-up outside any measurement
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_case(cases[0][1], cases[0][2], cases[0][3], layout_mode)
+        for name, path, model, title in cases:
+            if progress:
+                progress(name)
+            # The generator's progress lines are noise here
+            with contextlib.redirect_stdout(io.StringIO()):
+                results.append(measure(name, path, model, title, layout_mode, repeat))
+    return {
+        'commit': git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'reportlab': reportlab.Version,
+        'layout_mode': layout_mode,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def print_report(report):
+    print(f"Manual benchmark at {report['commit'] or 'unknown commit'} "
+          f"({report['layout_mode']} layout, best of {report['repeat']}, "
+          f"Python {report['python']}, ReportLab {report['reportlab']})")
+    header = ''.join(f"{stage:>9}" for stage in STAGES)
+    print(f"\n{'case':<12}{'lines':>8}{'pages':>7}{header}{'total':>9}"
+          f"{'lines/s':>10}{'pages/s':>9}{'peak MB':>9}{'dry run':>9}{'inline':>9}")
+    for r in report['results']:
+        stages = ''.join(f"{r['seconds'][stage] * 1000:9.1f}" for stage in STAGES)
+        print(f"{r['name']:<12}{r['lines']:>8}{r['pages']:>7}{stages}"
+              f"{r['total_seconds'] * 1000:9.1f}{r['lines_per_sec']:10.0f}"
+              f"{r['pages_per_sec']:9.1f}{r['peak_memory_mb']:9.1f}"
+              f"{r.get('dry_run_seconds', 0.0) * 1000:9.1f}"
+              f"{r.get('inline_seconds', 0.0) * 1000:9.1f}")
+    print("(stage times in ms)")
+
+
+def compare(report, baseline, threshold):
+    """Print total-time changes against a baseline report; return the regressed cases."""
+    previous = {r['name']: r for r in baseline['results']}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    regressed = []
+    for r in report['results']:
+        old = previous.get(r['name'])
+        if old is None or not old['total_seconds']:
+            print(f"  {r['name']:<12} (no baseline)")
+            continue
+        change = r['total_seconds'] / old['total_seconds'] - 1
+        worst = max(STAGES, key=lambda s: r['seconds'][s] - old['seconds'].get(s, 0.0))
+        flag = ''
+        if change > threshold:
+            regressed.append(r['name'])
+            flag = f"  ✗ slower (mostly {worst})"
+        print(f"  {r['name']:<12} {old['total_seconds'] * 1000:9.1f} -> "
+              f"{r['total_seconds'] * 1000:9.1f} ms  {change:+7.1%}{flag}")
+    return regressed
+
+
+def scale_list(value):
+    """argparse type for --scales: comma-separated positive sizes, '' for none."""
+    return [positive_int(s) for s in value.split(',') if s.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark manual parsing, layout and rendering.")
+    parser.add_argument('--layout', choices=('condensed', 'full'), default='condensed',
+                        help="which source of each catalog manual to use (default: condensed)")
+    parser.add_argument('--scales', type=scale_list, default=list(DEFAULT_SCALES),
+                        help="comma-separated synthetic manual sizes, '' for none (default: 10,100)")
+    parser.add_argument('--repeat', type=positive_int, default=3, help="timed runs per case (default: 3)")
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON")
+    parser.add_argument('--compare', metavar='PATH', help="earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    report = run(args.layout, args.scales, args.repeat,
+                 progress=lambda name: print(f"  running {name} ...", file=sys.stderr))
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
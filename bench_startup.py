@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Start-up benchmark for the Freedom Tools command-line scripts.
+
+Two measurements, each in fresh interpreters:
+
+- import cost of every script module, from ``python -X importtime``, with
+  the heaviest modules it pulls in;
+- wall time of the quick commands (catalog listing, source check, cache-hit
+  build and audit, search), best and median of several runs.
+
+    python3 bench_startup.py
+    python3 bench_startup.py --runs 10 --json startup.json --max-ms 150
+
+With --max-ms the exit status is 1 if any quick command's best run is slower,
+so the check can guard against an eager import creeping back in.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from manual_catalog import positive_int
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = ['generate_professional_pdfs', 'audit_manuals', 'manual_parser', 'manual_index', 'render_server']
+
+# Commands that must not load ReportLab or pypdf when their caches are warm
+QUICK_COMMANDS = {
+    'generate --list': ['generate_professional_pdfs.py', '--list'],
+    'generate --check': ['generate_professional_pdfs.py', '--check'],
+    'generate (cache hit)': ['generate_professional_pdfs.py'],
+    'audit (cache hit)': ['audit_manuals.py'],
+    'index query (up to date)': ['manual_index.py', 'query', 'kickback'],
+}
+
+# Module prefixes worth calling out when they show up in a quick path
+HEAVY_PACKAGES = ('reportlab.platypus', 'reportlab.pdfgen', 'reportlab.lib.styles', 'pypdf',
+                  'multiprocessing', 'concurrent.futures.process', 'importlib.metadata',
+                  'zipfile', 'http.server')
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us) tuples."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def import_profile(module, top=5):
+    """Import module in a fresh interpreter and summarize what it cost."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BASE, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr}")
+    rows = parse_importtime(proc.stderr)
+    total_us = next(cumulative for name, _, cumulative in rows if name == module)
+    heaviest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'import_ms': total_us / 1000,
+        'heaviest_self_ms': {name: self_us / 1000 for name, self_us, _ in heaviest},
+        'heavy_imports': heavy_imports(rows),
+    }
+
+
+def heavy_imports(rows):
+    names = [name for name, _, _ in rows]
+    return [package for package in HEAVY_PACKAGES
+            if any(name == package or name.startswith(package + '.') for name in names)]
+
+
+def time_command(args, runs):
+    """Best and median wall time of running a script, in milliseconds.
+
+    Two untimed runs come first: one warms the OS file cache and the tools'
+    own caches, the next (under -X importtime) records which heavy packages
+    the warm command ends up importing.
+    """
+    subprocess.run([sys.executable] + args, cwd=BASE, capture_output=True)
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                          cwd=BASE, capture_output=True, text=True)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=BASE, capture_output=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        'best_ms': min(times),
+        'median_ms': statistics.median(times),
+        'heavy_imports': heavy_imports(parse_importtime(proc.stderr)),
+    }
+
+
+def baseline_ms(runs):
+    """Wall time of an interpreter that does nothing, for reference."""
+    return time_command(['-c', 'pass'], runs)
+
+
+def run(runs=5):
+    return {
+        'python': sys.version.split()[0],
+        'interpreter': baseline_ms(runs),
+        'imports': [import_profile(module) for module in MODULES],
+        'commands': {label: time_command(args, runs) for label, args in QUICK_COMMANDS.items()},
+    }
+
+
+def print_report(results):
+    print(f"Python {results['python']}: bare interpreter "
+          f"{results['interpreter']['best_ms']:.1f} ms")
+    print("\nImport cost (python -X importtime):")
+    for entry in results['imports']:
+        heavy = ', '.join(entry['heavy_imports']) or '-'
+        print(f"  {entry['module']:<28} {entry['import_ms']:7.1f} ms   heavy: {heavy}")
+    print("\nQuick commands (wall time, best / median):")
+    for label, timing in results['commands'].items():
+        heavy = ', '.join(timing['heavy_imports']) or '-'
+        print(f"  {label:<28} {timing['best_ms']:7.1f} / {timing['median_ms']:5.1f} ms   heavy: {heavy}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure start-up time of the manual tools.")
+    parser.add_argument('--runs', type=positive_int, default=5, help="timed runs per command (default: 5)")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON")
+    parser.add_argument('--max-ms', type=float,
+                        help="fail if any quick command's best run exceeds this many milliseconds")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.max_ms is not None:
+        slow = [label for label, timing in results['commands'].items()
+                if timing['best_ms'] > args.max_ms]
+        for label in slow:
+            print(f"✗ {label} is over the {args.max_ms:.0f} ms budget")
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
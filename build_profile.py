@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Opt-in build instrumentation for the manual generator.
+
+A BuildProfile is handed to FreedomManualPDF (or generate_manual_pdf) and
+collects, per phase, the number of calls, wall time and net allocated memory
+blocks, plus a count of the flowables in the story by type and style.
+
+Phases nest: page decoration happens while a flowable is being laid out, for
+example. Every phase records both its total time and its self time (total
+minus nested phases), so the self times add up to the whole build.
+
+Phase names used by the generator:
+
+    parse                 reading and parsing the manual source
+    fit                   fitting the styles to a target page count (manual_fit)
+    cover / footer        building the cover and footer pages
+    story:<kind>          building flowables for one kind of block (story:warning, ...)
+    build                 the whole doc.build() call
+    layout:<flowable>     laying out one flowable type (layout:KeepTogether,
+                          layout:Paragraph/Warning, layout:Spacer, ...)
+    decoration            drawing headers and footers on a page
+    page numbers          filling in "Page x of y" once the page count is known
+    write                 serializing the PDF and writing it out
+
+Anything with the same phase() and count_flowable() methods can be passed in
+place of a BuildProfile to receive these events directly.
+"""
+
+import contextlib
+import json
+import sys
+import time
+from collections import Counter
+
+
+class BuildProfile:
+    """Per-phase wall time and allocation counts for one manual build."""
+
+    def __init__(self, name=''):
+        self.name = name
+        # phase name -> [calls, seconds, self seconds, blocks, self blocks]
+        self.phases = {}
+        self.flowables = Counter()
+        # One [child seconds, child blocks] accumulator per open phase
+        self._open = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed code as one call of the named phase."""
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        self._open.append([0.0, 0])
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = sys.getallocatedblocks() - blocks
+            child_seconds, child_blocks = self._open.pop()
+            if self._open:
+                self._open[-1][0] += elapsed
+                self._open[-1][1] += allocated
+            entry = self.phases.get(name)
+            if entry is None:
+                entry = self.phases[name] = [0, 0.0, 0.0, 0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += elapsed - child_seconds
+            entry[3] += allocated
+            entry[4] += allocated - child_blocks
+
+    def count_flowable(self, key, n=1):
+        self.flowables[key] += n
+
+    def total_seconds(self):
+        """Wall time covered by the profile (the sum of all self times)."""
+        return sum(entry[2] for entry in self.phases.values())
+
+    def report(self):
+        """The profile as a JSON-friendly dict."""
+        return {
+            'name': self.name,
+            'total_seconds': self.total_seconds(),
+            'phases': {
+                name: {
+                    'calls': calls,
+                    'seconds': seconds,
+                    'self_seconds': self_seconds,
+                    'allocated_blocks': blocks,
+                    'self_allocated_blocks': self_blocks,
+                }
+                for name, (calls, seconds, self_seconds, blocks, self_blocks) in self.phases.items()
+            },
+            'flowables': dict(self.flowables.most_common()),
+        }
+
+    def format(self, top=None):
+        """Human-readable report, phases ordered by self time."""
+        total = self.total_seconds() or 1.0
+        rows = sorted(self.phases.items(), key=lambda item: item[1][2], reverse=True)
+        lines = [f"Profile {self.name}: {self.total_seconds() * 1000:.1f} ms",
+                 f"  {'phase':<36}{'calls':>7}{'self ms':>10}{'self %':>8}"
+                 f"{'total ms':>10}{'net blocks':>12}"]
+        for name, (calls, seconds, self_seconds, blocks, self_blocks) in rows[:top]:
+            lines.append(f"  {name:<36}{calls:>7}{self_seconds * 1000:10.1f}"
+                         f"{self_seconds / total:8.1%}{seconds * 1000:10.1f}{self_blocks:12d}")
+        if self.flowables:
+            lines.append('  flowables: ' + ', '.join(
+                f"{key} {count}" for key, count in self.flowables.most_common()))
+        return '\n'.join(lines)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
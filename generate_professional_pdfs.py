@@ -4,618 +4,738 @@ Freedom Tools Professional Manual PDF Generator
 Creates beautifully formatted, consistent PDF manuals with headers, footers, and page numbers.
 """
 
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
-from reportlab.lib import colors
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, PageBreak, 
-    Table, TableStyle, KeepTogether, Frame, PageTemplate
-)
-from reportlab.pdfgen import canvas
-import re
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import time
+import traceback
 from datetime import datetime
 
+from manual_catalog import (
+    BASE, DEFAULT_LOCALE, CatalogError, add_selection_arguments, display_path, editions, non_negative_float,
+    positive_int, select_from_args,
+)
+from manual_parser import SECTION, load_manual, parser_fingerprint
 
-class NumberedCanvas(canvas.Canvas):
-    """Custom canvas that adds page numbers and headers/footers."""
-    
-    def __init__(self, *args, **kwargs):
-        canvas.Canvas.__init__(self, *args, **kwargs)
-        self._saved_page_states = []
-        self.model_number = kwargs.get('model_number', '')
-        self.tool_name = kwargs.get('tool_name', '')
-        
-    def showPage(self):
-        self._saved_page_states.append(dict(self.__dict__))
-        self._startPage()
-        
-    def save(self):
-        """Add page info to each page (page x of y)"""
-        num_pages = len(self._saved_page_states)
-        for state in self._saved_page_states:
-            self.__dict__.update(state)
-            self.draw_page_decorations(num_pages)
-            canvas.Canvas.showPage(self)
-        canvas.Canvas.save(self)
-        
-    def draw_page_decorations(self, page_count):
-        """Draw headers, footers, and page numbers."""
-        page_num = self._pageNumber
-        
-        # Skip decorations on cover page (page 1)
-        if page_num == 1:
-            return
-            
-        # Header
-        self.saveState()
-        self.setFont('Helvetica', 9)
-        self.setFillColor(colors.HexColor('#666666'))
-        
-        # Left side - Brand and model
-        self.drawString(0.75*inch, letter[1] - 0.5*inch, 
-                       f"FREEDOM TOOLS  |  {self.model_number}")
-        
-        # Right side - Tool name
-        text_width = self.stringWidth(self.tool_name, 'Helvetica', 9)
-        self.drawString(letter[0] - 0.75*inch - text_width, 
-                       letter[1] - 0.5*inch, 
-                       self.tool_name)
-        
-        # Header line
-        self.setStrokeColor(colors.HexColor('#0066cc'))
-        self.setLineWidth(0.5)
-        self.line(0.75*inch, letter[1] - 0.55*inch, 
-                 letter[0] - 0.75*inch, letter[1] - 0.55*inch)
-        
-        # Footer line
-        self.line(0.75*inch, 0.65*inch, 
-                 letter[0] - 0.75*inch, 0.65*inch)
-        
-        # Page number - centered
-        page_text = f"Page {page_num} of {page_count}"
-        text_width = self.stringWidth(page_text, 'Helvetica', 9)
-        self.drawString((letter[0] - text_width) / 2, 0.5*inch, page_text)
-        
-        # Copyright - left side
-        self.setFont('Helvetica', 8)
-        self.drawString(0.75*inch, 0.5*inch, 
-                       f"© {datetime.now().year} Freedom Tools")
-        
-        # Empty space on right side (no contact info)
-        
-        self.restoreState()
-
-
-class FreedomManualPDF:
-    """Generate professional PDF manuals for Freedom Tools."""
-    
-    def __init__(self, output_filename, model_number, tool_name):
-        self.output_filename = output_filename
-        self.model_number = model_number
-        self.tool_name = tool_name
-        self.story = []
-        self.styles = getSampleStyleSheet()
-        # Layout mode: 'full' prioritizes whitespace and clarity; 'condensed' targets ~10 pages.
-        self.layout_mode = 'condensed'
-        self._setup_custom_styles()
-        
-    def _setup_custom_styles(self):
-        """Create custom paragraph styles for consistent formatting."""
-        
-        def add_style_if_not_exists(name, style):
-            if name not in self.styles:
-                self.styles.add(style)
-        
-        # Cover page styles
-        add_style_if_not_exists('CoverBrand', ParagraphStyle(
-            name='CoverBrand',
-            parent=self.styles['Heading1'],
-            fontSize=32,
-            textColor=colors.HexColor('#0066cc'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold',
-            letterSpacing=2
-        ))
-        
-        add_style_if_not_exists('CoverTitle', ParagraphStyle(
-            name='CoverTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        add_style_if_not_exists('ModelNumber', ParagraphStyle(
-            name='ModelNumber',
-            parent=self.styles['Normal'],
-            fontSize=18,
-            textColor=colors.HexColor('#0066cc'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        add_style_if_not_exists('CoverSubtitle', ParagraphStyle(
-            name='CoverSubtitle',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            textColor=colors.HexColor('#666666'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica'
-        ))
-        
-        # Major section header style (top-level sections surrounded by ===== lines in source)
-        add_style_if_not_exists('MajorSectionHeader', ParagraphStyle(
-            name='MajorSectionHeader',
-            parent=self.styles['Heading1'],
-            fontSize=14,
-            textColor=colors.HexColor('#ffffff'),
-            spaceAfter=12,
-            spaceBefore=14,
-            fontName='Helvetica-Bold',
-            backColor=colors.HexColor('#004a99'),
-            leftIndent=12,
-            rightIndent=12,
-            borderPadding=8,
-            keepWithNext=1
-        ))
-
-        # Section header style
-        add_style_if_not_exists('SectionHeader', ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading1'],
-            fontSize=13,
-            textColor=colors.HexColor('#ffffff'),
-            spaceAfter=14,
-            spaceBefore=24,
-            fontName='Helvetica-Bold',
-            backColor=colors.HexColor('#0066cc'),
-            leftIndent=12,
-            rightIndent=12,
-            borderPadding=8
-        ))
-        
-        # Subsection header style
-        add_style_if_not_exists('SubsectionHeader', ParagraphStyle(
-            name='SubsectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=11,
-            textColor=colors.HexColor('#0066cc'),
-            spaceAfter=8,
-            spaceBefore=14,
-            fontName='Helvetica-Bold',
-            borderWidth=0,
-            borderPadding=0,
-            leftIndent=0,
-            keepWithNext=1
-        ))
-        
-        # Problem header style for troubleshooting
-        add_style_if_not_exists('ProblemHeader', ParagraphStyle(
-            name='ProblemHeader',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=4,
-            spaceBefore=12,
-            fontName='Helvetica-Bold',
-            leftIndent=0
-        ))
-        
-        # Body text style
-        add_style_if_not_exists('BodyText', ParagraphStyle(
-            name='BodyText',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=6,
-            alignment=TA_LEFT,
-            fontName='Helvetica',
-            leading=12
-        ))
-        
-        # Bullet point style
-        add_style_if_not_exists('BulletPoint', ParagraphStyle(
-            name='BulletPoint',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=4,
-            leftIndent=24,
-            bulletIndent=12,
-            fontName='Helvetica',
-            leading=12
-        ))
-        
-        # Warning style
-        add_style_if_not_exists('Warning', ParagraphStyle(
-            name='Warning',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#cc0000'),
-            spaceAfter=10,
-            spaceBefore=10,
-            fontName='Helvetica-Bold',
-            backColor=colors.HexColor('#fff5f5'),
-            borderWidth=2,
-            borderColor=colors.HexColor('#cc0000'),
-            borderPadding=10,
-            leading=12,
-            leftIndent=12,
-            rightIndent=12
-        ))
-        
-        # Note style
-        add_style_if_not_exists('Note', ParagraphStyle(
-            name='Note',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#0066cc'),
-            spaceAfter=10,
-            spaceBefore=10,
-            fontName='Helvetica-Bold',
-            backColor=colors.HexColor('#f0f8ff'),
-            borderWidth=2,
-            borderColor=colors.HexColor('#0066cc'),
-            borderPadding=10,
-            leading=12,
-            leftIndent=12,
-            rightIndent=12
-        ))
-        
-        # Footer style
-        add_style_if_not_exists('Footer', ParagraphStyle(
-            name='Footer',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#666666'),
-            alignment=TA_CENTER,
-            fontName='Helvetica',
-            leading=14
-        ))
-    
-    def add_cover_page(self, title, model, subtitle="INSTRUCTION MANUAL"):
-        """Add a professional cover page."""
-        # Add space from top
-        self.story.append(Spacer(1, 1.8*inch))
-        
-        # Brand name
-        brand = Paragraph("FREEDOM", self.styles['CoverBrand'])
-        self.story.append(brand)
-        self.story.append(Spacer(1, 0.1*inch))
-        
-        # Product title
-        title_para = Paragraph(title, self.styles['CoverTitle'])
-        self.story.append(title_para)
-        self.story.append(Spacer(1, 0.3*inch))
-        
-        # Model number
-        model_para = Paragraph(f"MODEL {model}", self.styles['ModelNumber'])
-        self.story.append(model_para)
-        self.story.append(Spacer(1, 0.6*inch))
-        
-        # Subtitle
-        subtitle_para = Paragraph(subtitle, self.styles['CoverSubtitle'])
-        self.story.append(subtitle_para)
-        self.story.append(Spacer(1, 1.2*inch))
-        
-        # Important notice
-        notice = Paragraph(
-            "<b>⚠ IMPORTANT:</b> Please read this manual carefully before using your tool. "
-            "Keep it in a safe place for future reference. Failure to follow instructions "
-            "may result in serious injury.",
-            self.styles['Warning']
-        )
-        self.story.append(notice)
-        
-        # Add page break
-        self.story.append(PageBreak())
-    
-    def parse_and_add_content(self, text_content):
-        """Parse text file and add formatted content to PDF."""
-        lines = text_content.split('\n')
-        i = 0
-
-        def is_separator(s: str) -> bool:
-            s = s.strip()
-            return len(s) >= 10 and set(s) == {'='}
-
-        def is_dashes_only(s: str) -> bool:
-            s = s.strip()
-            return len(s) >= 5 and set(s) == {'-'}
-
-        def should_skip_header_line(s: str) -> bool:
-            # Skip the text-based cover header lines that appear in the source TXT
-            if not s:
-                return True
-            if ('FREEDOM' in s and 'TOOLS' in s) or s.startswith('MODEL:') or s == 'INSTRUCTION MANUAL':
-                return True
-            return False
-
-        def start_major_section():
-            # We intentionally avoid forced page breaks here (page count explodes).
-            # keepWithNext on the header style prevents orphaned headings at page bottom.
-            return
-        
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Major section blocks in the source are formatted as:
-            # ========\nSECTION TITLE\n========
-            if is_separator(line):
-                j = i + 1
-                while j < len(lines) and not lines[j].strip():
-                    j += 1
-                if j >= len(lines):
-                    break
-                title = lines[j].strip()
-
-                k = j + 1
-                while k < len(lines) and not lines[k].strip():
-                    k += 1
-
-                if k < len(lines) and is_separator(lines[k].strip()):
-                    # It's a section block. Only treat it as a "major section" if it isn't part of
-                    # the decorative header at the top of the TXT.
-                    if not should_skip_header_line(title) and not title.startswith('FREEDOM '):
-                        start_major_section()
-                        self.story.append(Paragraph(title, self.styles['MajorSectionHeader']))
-                    i = k + 1
-                    continue
+# ReportLab (via manual_pdf), zipfile and the process pool are only imported
+# on the code paths that render something, so cache-hit runs, --list and
+# --check start without them. The layout names stay importable from here.
+_LAYOUT_NAMES = frozenset(
+    ('FreedomManualPDF', 'NumberedCanvas', 'PAGE_NUMBER_PLACEHOLDER', 'get_stylesheet')
+)
 
-                # Separator line not followed by a proper section block; skip it.
-                i += 1
-                continue
+# manual_pdf.py, manual_fit.py, manual_fonts.py and manual_inline.py sit next
+# to this script; their sources are part of the build key.
+LAYOUT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manual_pdf.py')
+FIT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manual_fit.py')
+FONTS_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manual_fonts.py')
+INLINE_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manual_inline.py')
 
-            # Skip the text-based header lines (non-section content at top / end)
-            if should_skip_header_line(line):
-                i += 1
-                continue
-            
-            # Skip empty lines
-            if not line:
-                i += 1
-                continue
 
-            # Skip underline lines made of dashes (titles above them are handled via lookahead)
-            if is_dashes_only(line):
-                i += 1
-                continue
+def __getattr__(name):
+    if name not in _LAYOUT_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import manual_pdf
+    value = getattr(manual_pdf, name)
+    globals()[name] = value
+    return value
 
-            # Title lines followed by dashed underlines are subsection headers
-            if (i + 1) < len(lines) and is_dashes_only(lines[i + 1].strip()):
-                # Prevent warnings/notes/problems from being styled as headings
-                if (not line.startswith('⚠') and not line.startswith('WARNING') and
-                    not line.startswith('NOTE:') and not line.startswith('IMPORTANT:') and
-                    not line.startswith('CAUTION:') and not line.startswith('PROBLEM:')):
-                    self.story.append(Paragraph(line, self.styles['SubsectionHeader']))
-                    i += 2
-                    continue
-            
-            # Uppercase headings in-body are treated as subsection headers (not major section bars)
-            if (line.isupper() and len(line) > 3 and
-                not line.startswith('⚠') and not line.startswith('WARNING') and
-                not line.startswith('NOTE:') and not line.startswith('IMPORTANT:') and
-                not line.startswith('CAUTION:') and not line.startswith('PROBLEM:')):
-                self.story.append(Paragraph(line, self.styles['SubsectionHeader']))
-                i += 1
-                continue
-            
-            # Problem headers in troubleshooting section
-            if line.startswith('PROBLEM:'):
-                problem = Paragraph(line, self.styles['ProblemHeader'])
-                self.story.append(problem)
-                i += 1
-                continue
-            
-            # Subsection headers (lines ending with colon)
-            if (line.endswith(':') and len(line) < 80 and 
-                not line.startswith('⚠') and not line.startswith('WARNING') and
-                not line.startswith('NOTE:') and not line.startswith('IMPORTANT:') and
-                not line.startswith('CAUTION:') and not line.startswith('•') and
-                not line.startswith('□') and not line.startswith('PROBLEM:')):
-                subsection = Paragraph(line.rstrip(':').rstrip('-').strip(), 
-                                     self.styles['SubsectionHeader'])
-                self.story.append(subsection)
-                i += 1
-                continue
-            
-            # Warning lines - collect multi-line warnings
-            if line.startswith('⚠') or line.startswith('WARNING'):
-                warning_lines = [line]
-                i += 1
-                
-                # Collect continuation lines
-                while i < len(lines):
-                    next_line = lines[i].strip()
-                    if (not next_line or next_line.startswith('⚠') or 
-                        next_line.startswith('WARNING') or next_line.isupper() or 
-                        next_line.startswith('□') or next_line.startswith('•') or 
-                        next_line.startswith('-') or re.match(r'^\d+\.', next_line) or
-                        next_line.startswith('PROBLEM:') or
-                        (next_line.endswith(':') and len(next_line) < 80)):
-                        break
-                    warning_lines.append(next_line)
-                    i += 1
-                
-                warning_text = ' '.join(warning_lines)
-                warning_text = warning_text.replace('⚠', '⚠ ')
-                warning = Paragraph(warning_text, self.styles['Warning'])
-                self.story.append(KeepTogether(warning))
-                continue
-            
-            # Note lines - collect multi-line notes
-            if line.startswith('NOTE:') or line.startswith('IMPORTANT:') or line.startswith('CAUTION:'):
-                note_lines = [line]
-                i += 1
-                
-                # Collect continuation lines
-                while i < len(lines):
-                    next_line = lines[i].strip()
-                    if (not next_line or next_line.startswith('NOTE:') or 
-                        next_line.startswith('IMPORTANT:') or next_line.startswith('CAUTION:') or 
-                        next_line.startswith('⚠') or next_line.startswith('WARNING') or 
-                        next_line.isupper() or next_line.startswith('□') or 
-                        next_line.startswith('•') or next_line.startswith('-') or 
-                        re.match(r'^\d+\.', next_line) or next_line.startswith('PROBLEM:') or
-                        (next_line.endswith(':') and len(next_line) < 80)):
-                        break
-                    note_lines.append(next_line)
-                    i += 1
-                
-                note_text = ' '.join(note_lines)
-                note = Paragraph(note_text, self.styles['Note'])
-                self.story.append(KeepTogether(note))
-                continue
-            
-            # Checkbox items
-            if line.startswith('□'):
-                bullet = Paragraph(f"• {line[1:].strip()}", self.styles['BulletPoint'])
-                self.story.append(bullet)
-                i += 1
-                continue
-            
-            # Bullet points
-            if line.startswith('•') or (line.startswith('-') and len(line) > 2 and line[1] == ' '):
-                bullet = Paragraph(line, self.styles['BulletPoint'])
-                self.story.append(bullet)
-                i += 1
-                continue
-            
-            # Numbered items
-            if re.match(r'^\d+\.', line):
-                bullet = Paragraph(line, self.styles['BulletPoint'])
-                self.story.append(bullet)
-                i += 1
-                continue
-            
-            # Regular paragraph
-            if len(line) > 0:
-                para = Paragraph(line, self.styles['BodyText'])
-                self.story.append(para)
-                i += 1
-                continue
-            
-            i += 1
-    
-    def add_footer_page(self):
-        """Add a final footer page with company information."""
-        self.story.append(PageBreak())
-        self.story.append(Spacer(1, 3*inch))
-        
-        footer_text = f"""
-        <para align=center>
-        <b><font size=16 color="#0066cc">FREEDOM TOOLS</font></b><br/>
-        <font size=12>Built for Performance, Designed for You</font><br/>
-        <br/>
-        <br/>
-        <br/>
-        <font size=9 color="#666666">© {datetime.now().year} Freedom Tools. All rights reserved.<br/>
-        Specifications subject to change without notice.</font>
-        </para>
-        """
-        
-        footer = Paragraph(footer_text, self.styles['Footer'])
-        self.story.append(footer)
-    
-    def build(self):
-        """Build the PDF document with custom canvas."""
-        doc = SimpleDocTemplate(
-            self.output_filename,
-            pagesize=letter,
-            rightMargin=0.6*inch,
-            leftMargin=0.6*inch,
-            topMargin=0.6*inch,
-            bottomMargin=0.6*inch
-        )
-        
-        # Build with custom canvas that adds page numbers
-        doc.build(
-            self.story,
-            canvasmaker=lambda *args, **kwargs: NumberedCanvas(
-                *args, 
-                model_number=self.model_number,
-                tool_name=self.tool_name,
-                **kwargs
-            )
-        )
-        print(f"✓ PDF created successfully: {self.output_filename}")
-
-
-def generate_manual_pdf(text_file, output_pdf, title, model):
-    """Generate a PDF manual from a text file."""
+
+# Bump when a change to this module should invalidate every cached PDF.
+GENERATOR_VERSION = '1.1'
+
+# On-disk manifest recording the inputs each output PDF was last built from,
+# kept next to the scripts whatever the working directory.
+BUILD_CACHE_FILE = os.path.join(BASE, '.manual_build_cache.json')
+
+# --watch polls sources this often, and acts on a file once it has been
+# quiet for the debounce period (editors often save in several steps).
+WATCH_INTERVAL = 0.2
+WATCH_DEBOUNCE = 0.3
+
+
+def font_styles(font=None, fallback_fonts=()):
+    """The style registry for a font family and fallback fonts (see manual_fonts).
+
+    None when neither is given: the stylesheet's Helvetica. Fonts are parsed
+    once per process, so every later manual and locale reuses them.
+    """
+    if not font and not fallback_fonts:
+        return None
+    from manual_fonts import family_styles
+    return family_styles(font, fallback_fonts)
+
+
+def generate_manual_pdf(text_file, output_pdf, title, model, profile=None, target_pages=None,
+                        locale=None, font=None, fallback_fonts=()):
+    """Generate a PDF manual from a text file.
+
+    profile is an optional build_profile.BuildProfile that receives per-phase
+    timings of the build. With target_pages the body styles are first fitted
+    (see manual_fit) so the manual takes at most that many pages. locale is
+    the language of the cover and page labels; font and fallback_fonts set
+    the type in a TrueType family (see font_styles()).
+    """
     print(f"\nGenerating PDF: {output_pdf}")
     print(f"  Title: {title}")
     print(f"  Model: {model}")
     
-    # Read the text file
-    with open(text_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Parse the text file (or reuse its cached document tree)
+    if profile is None:
+        tree = load_manual(text_file)
+    else:
+        with profile.phase('parse'):
+            tree = load_manual(text_file)
+    
+    if profile is None or not (font or fallback_fonts):
+        styles = font_styles(font, fallback_fonts)
+    else:
+        with profile.phase('fonts'):
+            styles = font_styles(font, fallback_fonts)
+    if target_pages:
+        from manual_fit import describe_fit, fit_manual
+        if profile is None:
+            fit = fit_manual(tree, model, title, target_pages, styles=styles, locale=locale)
+        else:
+            with profile.phase('fit'):
+                fit = fit_manual(tree, model, title, target_pages, styles=styles, locale=locale)
+        print(f"  {'Fit' if fit.fits else '✗ Fit'}: {describe_fit(fit)}")
+        styles = fit.styles
     
     # Create PDF
-    pdf = FreedomManualPDF(output_pdf, model, title)
+    from manual_pdf import FreedomManualPDF
+    pdf = FreedomManualPDF(output_pdf, model, title, profile=profile, styles=styles, locale=locale)
     pdf.add_cover_page(title, model)
-    pdf.parse_and_add_content(content)
+    pdf.add_manual(tree)
     # Avoid adding a whole extra page at the end; it hurts the 10-page goal.
     pdf.build()
 
 
-def main():
-    """Generate all three Freedom Tools manuals."""
+@functools.lru_cache(maxsize=None)
+def style_fingerprint():
+    """Hash of the generator and layout code, the parser and the ReportLab version.
+
+    The paragraph styles are built by manual_pdf's source on top of
+    ReportLab's sample stylesheet, so hashing that source and the ReportLab
+    version covers every style without loading ReportLab's layout engine.
+    """
+    import reportlab
+    sources = {}
+    for path in (__file__, LAYOUT_SOURCE, FIT_SOURCE, FONTS_SOURCE, INLINE_SOURCE):
+        with open(path, 'rb') as f:
+            sources[os.path.basename(path)] = hashlib.sha256(f.read()).hexdigest()
+    payload = json.dumps({
+        'version': GENERATOR_VERSION,
+        'sources': sources,
+        'parser': parser_fingerprint(),
+        'reportlab': reportlab.Version,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _file_sha256(path, size, mtime_ns):
+    # Keyed by size and mtime too, so a file replaced in place is hashed again
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def font_fingerprint(font=None, fallback_fonts=()):
+    """Hash of the font files a build uses: every face of font and the regular
+    face of each fallback font, so a .ttf replaced at the same path counts as
+    a change."""
+    from manual_fonts import font_family
+    paths = []
+    if font:
+        paths += [path for path in font_family(font)[1:] if path]
+    paths += [font_family(fallback).regular for fallback in fallback_fonts]
+    digests = {}
+    for path in paths:
+        st = os.stat(path)
+        digests[path] = _file_sha256(path, st.st_size, st.st_mtime_ns)
+    payload = json.dumps(digests, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def manual_build_key(manual):
+    """Cache key for a catalog entry: source text, styles, generator, labels, page target,
+    locale and fonts."""
+    with open(manual['text_file'], 'rb') as f:
+        text_hash = hashlib.sha256(f.read()).hexdigest()
+    inputs = {
+        'text': text_hash,
+        'style': style_fingerprint(),
+        'title': manual['title'],
+        'model': manual['model'],
+        # The footer prints the current year, so a new year means a new PDF.
+        'year': datetime.now().year,
+    }
+    if manual.get('target_pages'):
+        inputs['target_pages'] = manual['target_pages']
+    for field in ('locale', 'font', 'fallback_fonts'):
+        if manual.get(field):
+            inputs[field] = manual[field]
+    if manual.get('font') or manual.get('fallback_fonts'):
+        inputs['font_files'] = font_fingerprint(manual.get('font'), manual.get('fallback_fonts', ()))
+    payload = json.dumps(inputs, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class BuildCache:
+    """Manifest of build keys for previously generated PDFs."""
+    
+    def __init__(self, path=BUILD_CACHE_FILE):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def is_fresh(self, output_pdf, key):
+        """True if output_pdf exists and was built from exactly these inputs."""
+        return self.entries.get(output_pdf) == key and os.path.exists(output_pdf)
+    
+    def record(self, output_pdf, key):
+        self.entries[output_pdf] = key
+    
+    def save(self):
+        # Write atomically so an interrupted run never leaves a corrupt manifest
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def build_manual(manual, profile=False, profile_dir=None):
+    """Build one entry of the manuals list and return a result record.
+
+    Output from the generator is captured rather than printed so that workers
+    in a process pool never interleave their messages; the parent prints the
+    captured log once the result comes back.
+
+    With profile the build is instrumented and its phase report is appended
+    to the log. With profile_dir the report is also saved there as
+    <model>.json, next to a cProfile dump of the build (<model>.pstats).
+    """
+    log = io.StringIO()
+    error = None
+    build_profile = None
+    if profile or profile_dir:
+        from build_profile import BuildProfile
+        build_profile = BuildProfile(manual['model'])
+    profiler = None
+    if profile_dir:
+        import cProfile
+        profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            if profiler is not None:
+                profiler.enable()
+            try:
+                generate_manual_pdf(
+                    display_path(manual['text_file']),
+                    display_path(manual['output_pdf']),
+                    manual['title'],
+                    manual['model'],
+                    profile=build_profile,
+                    target_pages=manual.get('target_pages'),
+                    locale=manual.get('locale'),
+                    font=manual.get('font'),
+                    fallback_fonts=manual.get('fallback_fonts', ())
+                )
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+            if build_profile is not None:
+                print(build_profile.format())
+            if profile_dir:
+                os.makedirs(profile_dir, exist_ok=True)
+                name = manual['model'] + (f".{manual['locale']}" if manual.get('locale') else '')
+                build_profile.save(os.path.join(profile_dir, f"{name}.json"))
+                profiler.dump_stats(os.path.join(profile_dir, f"{name}.pstats"))
+    except Exception:
+        error = traceback.format_exc()
+    return {
+        'output_pdf': manual['output_pdf'],
+        'model': manual['model'],
+        'ok': error is None,
+        'skipped': False,
+        'seconds': time.perf_counter() - start,
+        'log': log.getvalue(),
+        'error': error,
+    }
+
+
+def catalog_manual_pdf(manual):
+    """A FreedomManualPDF with a catalog manual's content, fitted to its target_pages."""
+    from manual_pdf import FreedomManualPDF
+    tree = load_manual(manual['text_file'])
+    locale = manual.get('locale')
+    styles = font_styles(manual.get('font'), manual.get('fallback_fonts', ()))
+    if manual.get('target_pages'):
+        from manual_fit import fit_manual
+        styles = fit_manual(tree, manual['model'], manual['title'], manual['target_pages'],
+                            styles=styles, locale=locale).styles
+    pdf = FreedomManualPDF(None, manual['model'], manual['title'], styles=styles, locale=locale)
+    pdf.add_cover_page(manual['title'], manual['model'])
+    pdf.add_manual(tree)
+    return pdf
+
+
+def write_manuals_zip(zip_path, manuals):
+    """Build every manual straight into a zip archive, without temp PDF files.
+
+    Each PDF is streamed into its archive entry as it is rendered. Returns the
+    list of entry names written.
+    """
+    import zipfile
+    names = []
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for manual in manuals:
+            name = os.path.basename(manual['output_pdf'])
+            print(f"\nAdding {name} to {zip_path}")
+            pdf = catalog_manual_pdf(manual)
+            info = zipfile.ZipInfo(name, time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with zf.open(info, 'w') as entry:
+                pdf.build(entry)
+            names.append(name)
+    return names
+
+
+def write_binder(binder_path, manuals, title=None):
+    """Build the selected manuals into one combined binder PDF.
+
+    Sections shared by several manuals are printed once (see manual_binder).
+    Each edition is a part of its own. The --font options apply to the whole
+    binder, and so does the editions' locale when they all share one.
+    Returns the ManualBinder, for its shared sections.
+    """
+    from manual_binder import BINDER_TITLE, ManualBinder
+    locales = {manual.get('locale') for manual in manuals}
+    locale = locales.pop() if len(locales) == 1 else None
+    styles = None
+    if manuals:
+        styles = font_styles(manuals[0].get('font'), manuals[0].get('fallback_fonts', ()))
+    binder = ManualBinder(binder_path, title or BINDER_TITLE, styles=styles, locale=locale)
+    for manual in manuals:
+        print(f"Adding {manual['model']} ({display_path(manual['text_file'])})")
+        binder.add(manual['model'], manual['title'], load_manual(manual['text_file']),
+                   locale=manual.get('locale'))
+    binder.build()
+    return binder
+
+
+def list_manuals(cache, manuals):
+    """Print the catalog with the build-cache state of each output PDF."""
+    for manual in manuals:
+        try:
+            state = 'up to date' if cache.is_fresh(manual['output_pdf'], manual_build_key(manual)) else 'stale'
+        except OSError:
+            state = 'missing source'
+        print(f"{manual['model']:<8} {state:<14} {display_path(manual['text_file'])} -> "
+              f"{display_path(manual['output_pdf'])}")
+        print(f"{'':<8} {manual['title']}")
+
+
+def check_sources(manuals):
+    """Parse every condensed and full source without rendering; return problems found."""
+    problems = []
+    for manual in manuals:
+        for key in ('text_file', 'full_text_file'):
+            path = display_path(manual[key])
+            try:
+                tree = load_manual(path)
+            except (OSError, UnicodeDecodeError) as e:
+                problems.append(f"{manual['model']}: {path}: {e}")
+                continue
+            nodes = sum(1 for _ in tree.walk())
+            if not tree.children:
+                problems.append(f"{manual['model']}: {path}: no content")
+            print(f"{manual['model']:<8} {nodes:>5} blocks  {path}")
+    return problems
+
+
+def dry_run_manuals(manuals, sections=False):
+    """Paginate each manual without rendering it and report its layout; return problems found.
+
+    Every manual gets its page count, the page each major section starts on
+    (every subsection too with sections=True) and any layout issues. Boxes
+    split across pages and orphaned headings are warnings; a manual over its
+    target_pages, an overflowing line or a flowable too large for a page is
+    a problem.
+    """
+    problems = []
+    for manual in manuals:
+        try:
+            report = catalog_manual_pdf(manual).dry_run()
+        except (OSError, UnicodeDecodeError) as e:
+            problems.append(f"{manual['model']}: {display_path(manual['text_file'])}: {e}")
+            continue
+        target = manual.get('target_pages')
+        print(f"{manual['model']:<8} {report.pages:>3} pages"
+              f"{f' (target {target})' if target else ''}  "
+              f"{len(report.issues)} issue{'s' if len(report.issues) != 1 else ''}  "
+              f"{report.seconds * 1000:.0f} ms  {display_path(manual['text_file'])}")
+        for section in report.sections:
+            if sections or section.kind == SECTION:
+                indent = '  ' if section.kind == SECTION else '    '
+                print(f"{'':<8} {indent}p{section.page:<4}{section.title[:60]}")
+        for issue in report.issues:
+            mark = '⚠' if issue.problem in ('split box', 'orphan heading', 'widow line') else '✗'
+            detail = f" ({issue.detail})" if issue.detail else ''
+            text = f" {issue.text[:50]!r}" if issue.text else ''
+            print(f"{'':<8} {mark} p{issue.page} {issue.problem}{text}{detail}")
+            if mark == '✗':
+                problems.append(f"{manual['model']}: page {issue.page}: {issue.problem}{detail}")
+        if target and report.pages > target:
+            problems.append(f"{manual['model']}: {report.pages} pages, over its target of {target}")
+    return problems
+
+
+def _stat_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def watched_files(catalog, manuals):
+    """Files --watch reacts to: the manuals' sources and the catalog itself."""
+    paths = {os.path.abspath(catalog.path)}
+    for manual in manuals:
+        paths.add(manual['text_file'])
+        paths.add(manual['full_text_file'])
+    return paths
+
+
+def rebuild_changed(manuals, cache, changed):
+    """Rebuild the manuals whose build inputs changed; re-parse changed full sources.
+
+    A save that leaves the content as it was (same build key) rebuilds nothing.
+    """
+    for manual in manuals:
+        try:
+            key = manual_build_key(manual)
+        except OSError as e:
+            print(f"✗ {manual['model']}: cannot read {display_path(manual['text_file'])}: {e.strerror}")
+            continue
+        if cache.is_fresh(manual['output_pdf'], key):
+            if manual['full_text_file'] in changed:
+                # Only the full rewrite changed: refresh its parse cache and validate it
+                try:
+                    blocks = sum(1 for _ in load_manual(manual['full_text_file']).walk())
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"✗ {manual['model']}: {display_path(manual['full_text_file'])}: {e}")
+                else:
+                    print(f"✓ {manual['model']:<8} parsed {blocks} blocks from "
+                          f"{display_path(manual['full_text_file'])}")
+            continue
+        result = build_manual(manual)
+        if result['ok']:
+            cache.record(manual['output_pdf'], key)
+            cache.save()
+            print(f"✓ {manual['model']:<8} rebuilt in {result['seconds']:.2f}s  "
+                  f"{display_path(manual['output_pdf'])}")
+        else:
+            print(f"✗ Error generating {display_path(manual['output_pdf'])}:")
+            print(result['error'], end='')
+
+
+def select_manuals(args):
+    """The catalog and the manuals the command line selects.
+
+    Each manual comes once per --locale edition it has (English only by
+    default), with --target-pages and the --font options applied.
+    """
+    catalog, manuals = select_from_args(args)
+    if args.locale:
+        locales = None if 'all' in args.locale else args.locale
+        manuals = [edition for manual in manuals for edition in editions(manual, locales)]
+    overrides = {}
+    if args.target_pages:
+        overrides['target_pages'] = args.target_pages
+    if args.font:
+        overrides['font'] = args.font
+    if args.fallback_font:
+        overrides['fallback_fonts'] = tuple(args.fallback_font)
+    if overrides:
+        manuals = [dict(manual, **overrides) for manual in manuals]
+    return catalog, manuals
+
+
+def watch_manuals(args, cache, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE):
+    """Rebuild manuals whenever their sources change, until interrupted.
+
+    Sources are polled for size/mtime changes, so no file-system notification
+    service is needed. The process stays up between builds with ReportLab,
+    the styles and the parser caches loaded, so only the edited manual is
+    laid out again. Editing the catalog reloads it.
+    """
+    from manual_pdf import get_stylesheet
+    get_stylesheet()
+    
+    catalog, manuals = select_manuals(args)
+    seen = {path: _stat_signature(path) for path in watched_files(catalog, manuals)}
+    pending = {}  # changed path -> when it last changed
+    print(f"\nWatching {len(seen)} files for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            now = time.monotonic()
+            for path, signature in list(seen.items()):
+                current = _stat_signature(path)
+                if current != signature:
+                    seen[path] = current
+                    pending[path] = now
+            ready = {path for path, changed_at in pending.items() if now - changed_at >= debounce}
+            if not ready:
+                continue
+            for path in ready:
+                del pending[path]
+            
+            if os.path.abspath(catalog.path) in ready:
+                try:
+                    catalog, manuals = select_manuals(args)
+                except CatalogError as e:
+                    print(f"✗ {e}")
+                    continue
+                print(f"Reloaded {display_path(catalog.path)}: {len(manuals)} manuals")
+                for path in watched_files(catalog, manuals):
+                    seen.setdefault(path, _stat_signature(path))
+                targets = manuals
+            else:
+                models = {manual['model'] for path in ready for manual in catalog.for_file(path)}
+                targets = [manual for manual in manuals if manual['model'] in models]
+            rebuild_changed(targets, cache, ready)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Freedom Tools PDF manuals.")
+    parser.add_argument(
+        '-j', '--jobs', type=positive_int, nargs='?', default=1, const=None,
+        help="number of worker processes (default: 1; -j alone: one per CPU core)"
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="rebuild every manual even if its cached build is up to date"
+    )
+    parser.add_argument(
+        '--cache-file', default=BUILD_CACHE_FILE,
+        help="build cache manifest path (default: .manual_build_cache.json next to the scripts)"
+    )
+    parser.add_argument(
+        '--zip', metavar='PATH',
+        help="write all manuals into one zip archive instead of individual PDFs"
+    )
+    parser.add_argument(
+        '--binder', metavar='PATH',
+        help="write all manuals into one combined PDF, printing shared sections once"
+    )
+    parser.add_argument(
+        '--binder-title', metavar='TITLE',
+        help="cover title of the --binder PDF"
+    )
+    parser.add_argument(
+        '--list', action='store_true',
+        help="list the manuals and whether each PDF is up to date, then exit"
+    )
+    parser.add_argument(
+        '--check', action='store_true',
+        help="parse every manual source without rendering, then exit"
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help="lay every manual out without rendering it; print page counts, section "
+             "pages and layout issues, then exit (non-zero on overflow or a missed "
+             "page target)"
+    )
+    parser.add_argument(
+        '--sections', action='store_true',
+        help="with --dry-run, list subsections as well as major sections"
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="instrument each build and print per-phase times and flowable counts "
+             "(implies --force)"
+    )
+    parser.add_argument(
+        '--profile-dir', metavar='DIR',
+        help="also save each manual's phase report (<model>.json) and a cProfile "
+             "dump (<model>.pstats) in DIR (implies --profile)"
+    )
+    parser.add_argument(
+        '--target-pages', type=positive_int, metavar='N',
+        help="shrink spacing, then type, until each manual fits in N pages "
+             "(overrides the catalog's target_pages)"
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="after building, keep running and rebuild manuals as their sources change"
+    )
+    parser.add_argument(
+        '--debounce', type=non_negative_float, default=WATCH_DEBOUNCE, metavar='SECONDS',
+        help=f"with --watch, wait until a file has been quiet this long "
+             f"(default: {WATCH_DEBOUNCE})"
+    )
+    parser.add_argument(
+        '--locale', action='append', metavar='CODE',
+        help=f"build the editions in this language (\"es\", \"fr-CA\"; the catalog's "
+             f"locales), from <source>.CODE.txt into <output>.CODE.pdf; repeatable, "
+             f"or 'all' for every edition (default: {DEFAULT_LOCALE} only)"
+    )
+    parser.add_argument(
+        '--font', metavar='FAMILY',
+        help="set the manuals in a TrueType family: a bundled one (Vera) or the "
+             "regular face's .ttf file, with its -Bold/-Italic/-BoldItalic siblings "
+             "(default: Helvetica)"
+    )
+    parser.add_argument(
+        '--fallback-font', action='append', metavar='TTF',
+        help="font for the characters the main font lacks (symbols such as ⚠ □ ✓, "
+             "other scripts); repeatable, tried in order"
+    )
+    add_selection_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.watch:
+        # These modes exit after one pass; there is nothing to keep watching for
+        for option in ('zip', 'binder', 'dry_run', 'list', 'check'):
+            if getattr(args, option):
+                parser.error(f"--watch cannot be combined with --{option.replace('_', '-')}")
+    return args
+
+
+def main(argv=None):
+    """Generate the Freedom Tools manuals selected from the catalog (all by default)."""
+    args = parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
+    try:
+        _, manuals = select_manuals(args)
+    except CatalogError as e:
+        print(f"✗ {e}")
+        return 2
+    if not manuals:
+        # Nothing matching a --changed selection is normal; an unknown model is not
+        print("No manuals selected.")
+        return 2 if args.model else 0
+    if args.font or args.fallback_font:
+        # Load the fonts once up front, so a bad name fails before any build
+        from manual_fonts import FontError
+        try:
+            font_styles(args.font, args.fallback_font or ())
+        except FontError as e:
+            print(f"✗ {e}")
+            return 2
+    
+    if args.list:
+        list_manuals(BuildCache(args.cache_file), manuals)
+        return 0
+    if args.check:
+        problems = check_sources(manuals)
+        for problem in problems:
+            print(f"✗ {problem}")
+        return 1 if problems else 0
+    if args.dry_run:
+        problems = dry_run_manuals(manuals, args.sections)
+        for problem in problems:
+            print(f"✗ {problem}")
+        return 1 if problems else 0
+
     print("=" * 70)
     print("Freedom Tools Professional Manual PDF Generator")
     print("=" * 70)
     
-    manuals = [
-        {
-            'text_file': 'FT1001_Drill_Manual_CONDENSED.txt',
-            'output_pdf': 'Freedom_FT1001_Drill_Manual_Condensed.pdf',
-            'title': '18V Cordless Drill',
-            'model': 'FT1001'
-        },
-        {
-            'text_file': 'FT1003_MiniSaw_Manual_CONDENSED.txt',
-            'output_pdf': 'Freedom_FT1003_MiniSaw_Manual_Condensed.pdf',
-            'title': '18V Cordless Mini Saw',
-            'model': 'FT1003'
-        },
-        {
-            'text_file': 'FT1002_OscillatingTool_Manual_CONDENSED.txt',
-            'output_pdf': 'Freedom_FT1002_OscillatingTool_Manual_Condensed.pdf',
-            'title': '18V Cordless Oscillating Multi-Tool',
-            'model': 'FT1002'
-        },
-        {
-            'text_file': 'FT1004_RotaryTool_Manual_CONDENSED.txt',
-            'output_pdf': 'Freedom_FT1004_RotaryTool_Manual_Condensed.pdf',
-            'title': '18V Cordless Rotary Tool',
-            'model': 'FT1004'
-        }
-    ]
     
+    start = time.perf_counter()
+    
+    if args.zip:
+        names = write_manuals_zip(args.zip, manuals)
+        print(f"\n✓ {len(names)} manuals written to {args.zip} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return 0
+    if args.binder:
+        binder = write_binder(args.binder, manuals, args.binder_title)
+        print(f"\n✓ {len(manuals)} manuals bound into {args.binder}: "
+              f"{os.path.getsize(args.binder)} bytes, {len(binder.shared)} shared sections, "
+              f"{time.perf_counter() - start:.2f}s")
+        return 0
+    
+    # Skip manuals whose source, styles and generator are unchanged since the last build;
+    # a profiling run always builds, since a skipped manual has nothing to measure
+    profile = args.profile or bool(args.profile_dir)
+    force = args.force or profile
+    cache = BuildCache(args.cache_file)
+    keys = {}
+    results = {}
+    stale = []
     for manual in manuals:
         try:
-            generate_manual_pdf(
-                manual['text_file'],
-                manual['output_pdf'],
-                manual['title'],
-                manual['model']
-            )
-        except Exception as e:
-            print(f"✗ Error generating {manual['output_pdf']}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            key = manual_build_key(manual)
+        except OSError:
+            # Let build_manual report the unreadable source like any other failure
+            key = None
+        keys[manual['output_pdf']] = key
+        if key and not force and cache.is_fresh(manual['output_pdf'], key):
+            results[manual['output_pdf']] = {
+                'output_pdf': manual['output_pdf'],
+                'model': manual['model'],
+                'ok': True,
+                'skipped': True,
+                'seconds': 0.0,
+                'log': '',
+                'error': None,
+            }
+        else:
+            stale.append(manual)
+    
+    if jobs > 1 and len(stale) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+            built = list(pool.map(functools.partial(
+                build_manual, profile=profile, profile_dir=args.profile_dir), stale))
+    else:
+        built = [build_manual(manual, profile, args.profile_dir) for manual in stale]
+    
+    for result in built:
+        results[result['output_pdf']] = result
+        if result['ok']:
+            cache.record(result['output_pdf'], keys[result['output_pdf']])
+    cache.save()
+    results = [results[manual['output_pdf']] for manual in manuals]
+    elapsed = time.perf_counter() - start
+    
+    # Report everything from the parent, in catalog order
+    for result in results:
+        print(result['log'], end='')
+        if not result['ok']:
+            print(f"✗ Error generating {display_path(result['output_pdf'])}:")
+            print(result['error'], end='')
     
+    failed = [r for r in results if not r['ok']]
     print("\n" + "=" * 70)
     print("PDF Generation Complete!")
     print("=" * 70)
+    for result in results:
+        mark = '✓' if result['ok'] else '✗'
+        status = 'cached' if result['skipped'] else f"{result['seconds']:6.2f}s"
+        print(f"  {mark} {result['model']:<8} {status:>7}  {display_path(result['output_pdf'])}")
+    skipped = sum(1 for r in results if r['skipped'])
+    print(f"  {len(results) - len(failed) - skipped} built, {skipped} up to date, "
+          f"{len(failed)} failed in {elapsed:.2f}s ({jobs} job{'s' if jobs != 1 else ''})")
+    if args.watch:
+        return watch_manuals(args, cache, debounce=args.debounce)
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
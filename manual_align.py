@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Section-level alignment of a supplier manual with its rewrite.
+
+The keyword audit says that a word is missing from a rewrite; this module
+says which part of the original lost content, and how much. Both texts are
+split into sections:
+
+    original    the text extracted from the supplier PDF, cut at the lines
+                that look like headings ("3) Personal safety", "Residual
+                risks", "METAL CUTTING (FIGURE H)"), after dropping the page
+                furniture repeated on most pages
+    rewrite     the parsed manual: one section per subsection, plus the
+                blocks directly under each major section
+
+Each section becomes a set of shingles: runs of shingle_size content terms,
+where a term is a word with stop words dropped, cut to STEM_CHARS letters so
+that "charger" and "charging" agree. A rewrite says things in its own words,
+so single terms (the default) measure what is still covered; shingle_size=2
+or more measures how much of the wording survived.
+
+A section's coverage is the share of its shingles found anywhere in the
+rewrite. It is aligned with the rewrite section sharing the most of them,
+weighted by rarity (IDF), so common words do not decide the match. The
+rewrite's shingles are indexed once (shingle -> sections), which makes the
+whole alignment linear in the length of the two texts rather than the
+pairwise (quadratic) comparison difflib would do.
+
+    from manual_align import section_coverage
+    for section in section_coverage(original_pages, load_manual(path)):
+        print(section.title, section.page, f"{section.coverage:.0%}", section.match)
+
+The original is split and covered one section at a time, so only the text
+of the section being read is held. Finding the page furniture needs every
+page first; a caller that streams the pages counts it on an earlier pass
+(PageFurniture) and passes it in, otherwise the pages are read into a list.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, namedtuple
+from collections.abc import Iterable, Iterator
+
+from manual_parser import SECTION, SUBSECTION, ManualNode
+
+# Terms are this many letters at most; a cheap stand-in for stemming
+STEM_CHARS = 5
+# Shorter words are never terms
+MIN_TERM_CHARS = 3
+# Missing terms listed per section
+MISSING_TERMS = 8
+# A heading line is at most this long
+MAX_HEADING_CHARS = 60
+MAX_HEADING_WORDS = 8
+# A line on at least this share of the pages (and 3 of them) is page furniture
+FURNITURE_SHARE = 0.5
+# Page furniture is looked for among this many lines at the top and at the
+# bottom of each page
+FURNITURE_LINES = 3
+
+STOP_WORDS = frozenset('''
+    about after all also and any are been before being both but can could does
+    doing down each for from had has have into its may more most must not off
+    once only other out over own per same should some such than that the their
+    them then there these they this those through too under until very was
+    were what when where which while who will with would you your
+'''.split())
+
+FRONT_MATTER = '(front matter)'
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_HEADING_RE = re.compile(r'(?:\d+\)\s+)?[A-Z][^.!?;,]*:?\Z')
+_SENTENCE_END = ('.', '!', '?', ':')
+
+OriginalSection = namedtuple('OriginalSection', 'title page text')
+OriginalSection.__doc__ = """A section of a supplier manual: heading, 1-based page it starts on, text."""
+
+SectionCoverage = namedtuple('SectionCoverage',
+                             'title page shingles coverage match match_share missing')
+SectionCoverage.__doc__ = """How much of one original section the rewrite covers.
+
+shingles: distinct shingles in the original section.
+coverage: share of them found anywhere in the rewrite (0..1).
+match: title of the rewrite section it aligns with (None if nothing matched).
+match_share: share of the covered shingles found in that section.
+missing: up to MISSING_TERMS words of the section the rewrite never uses,
+    most frequent first.
+"""
+
+
+def content_terms(text: str) -> list[tuple[str, str]]:
+    """(term, word) of every content word of text, in order."""
+    return [(word[:STEM_CHARS], word) for word in _WORD_RE.findall(text.lower())
+            if len(word) >= MIN_TERM_CHARS and word not in STOP_WORDS]
+
+
+def shingles(terms: list[str], size: int = 1) -> set[str]:
+    """Distinct runs of size consecutive terms."""
+    if size == 1:
+        return set(terms)
+    return {' '.join(terms[i:i + size]) for i in range(len(terms) - size + 1)}
+
+
+def _is_heading(line: str, previous: str | None) -> bool:
+    if len(line) > MAX_HEADING_CHARS or not _HEADING_RE.match(line):
+        return False
+    words = line.split()
+    if len(words) > MAX_HEADING_WORDS:
+        return False
+    if len(words) == 1 and not (line.isupper() and not line.endswith(':')):
+        # "Warning", "Caution:", "IMPORTANT:" label a paragraph, not a section
+        return False
+    # A heading starts after a finished sentence, not in the middle of one
+    return previous is None or previous.endswith(_SENTENCE_END)
+
+
+def _page_lines(page: str) -> list[str]:
+    return [line.strip() for line in page.splitlines() if line.strip()]
+
+
+class PageFurniture:
+    """Lines (running headers and footers) repeated on most pages, counted page by page.
+
+    Only the first and last FURNITURE_LINES lines of a page are candidates,
+    so the count holds a few lines per page rather than the text.
+    """
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.seen: Counter = Counter()
+
+    def add(self, page: str) -> None:
+        lines = _page_lines(page)
+        self.pages += 1
+        self.seen.update(set(lines[:FURNITURE_LINES] + lines[-FURNITURE_LINES:]))
+
+    def lines(self) -> set[str]:
+        if self.pages < 3:
+            return set()
+        least = max(3, FURNITURE_SHARE * self.pages)
+        return {line for line, count in self.seen.items() if count >= least}
+
+
+def split_original(pages: Iterable[str], furniture: set[str] | None = None) -> Iterator[OriginalSection]:
+    """Cut the extracted pages of a supplier PDF into sections at heading lines.
+
+    Text before the first heading is FRONT_MATTER. Page numbers and page
+    furniture are dropped. Sections are yielded as they end. Without
+    furniture (see PageFurniture.lines()) the pages are read into a list to
+    find it first.
+    """
+    if furniture is None:
+        pages = list(pages)
+        counter = PageFurniture()
+        for page in pages:
+            counter.add(page)
+        furniture = counter.lines()
+    title, start, lines = FRONT_MATTER, 1, []
+    previous = None
+    for number, page in enumerate(pages, 1):
+        for line in _page_lines(page):
+            if line in furniture or line.isdigit():
+                continue
+            if _is_heading(line, previous):
+                if lines or title != FRONT_MATTER:
+                    yield OriginalSection(title, start, '\n'.join(lines))
+                title, start, lines = line, number, []
+            else:
+                lines.append(line)
+            previous = line
+    yield OriginalSection(title, start, '\n'.join(lines))
+
+
+def rewrite_sections(tree: ManualNode) -> list[tuple[str, str]]:
+    """(title, text) per subsection of a parsed manual, plus per-section blocks.
+
+    Blocks directly under a major section form a unit of their own, titled
+    with the section; a subsection is titled "SECTION / Subsection".
+    """
+    units = []
+
+    def add(title: str, nodes: list[ManualNode], heading: str = '') -> None:
+        lines = [heading] if heading else []
+        lines += [node.text for top in nodes for node in (top, *top.walk())]
+        if lines:
+            units.append((title, '\n'.join(lines)))
+
+    loose = []
+    for node in tree.children:
+        if node.kind == SECTION:
+            if loose:
+                add(FRONT_MATTER, loose)
+                loose = []
+            direct = [child for child in node.children if child.kind != SUBSECTION]
+            add(node.text, direct, node.text)
+            for child in node.children:
+                if child.kind == SUBSECTION:
+                    add(f"{node.text} / {child.text}", [child])
+        elif node.kind == SUBSECTION:
+            add(node.text, [node])
+        else:
+            loose.append(node)
+    if loose:
+        add(FRONT_MATTER, loose)
+    return units
+
+
+class RewriteIndex:
+    """Shingles of a rewrite's sections, indexed by shingle."""
+
+    def __init__(self, sections: list[tuple[str, str]], shingle_size: int = 1):
+        self.titles = [title for title, _ in sections]
+        self.shingle_size = shingle_size
+        # shingle -> indexes of the sections that contain it
+        self.postings: dict[str, list[int]] = {}
+        # every term used anywhere, whatever the shingle size
+        self.vocabulary: set[str] = set()
+        for i, (_, text) in enumerate(sections):
+            terms = [term for term, _ in content_terms(text)]
+            self.vocabulary.update(terms)
+            for shingle in shingles(terms, shingle_size):
+                self.postings.setdefault(shingle, []).append(i)
+
+    def idf(self, shingle: str) -> float:
+        return math.log((1 + len(self.titles)) / len(self.postings[shingle]))
+
+    def cover(self, title: str, page: int, text: str) -> SectionCoverage:
+        """Coverage and alignment of one original section."""
+        pairs = content_terms(text)
+        terms = [term for term, _ in pairs]
+        own = shingles(terms, self.shingle_size)
+        covered = [shingle for shingle in own if shingle in self.postings]
+
+        scores = Counter()
+        for shingle in covered:
+            weight = self.idf(shingle)
+            for i in self.postings[shingle]:
+                scores[i] += weight
+        match = match_share = None
+        if scores:
+            best = max(scores, key=lambda i: (scores[i], -i))
+            match = self.titles[best]
+            match_share = sum(1 for shingle in covered if best in self.postings[shingle]) / len(covered)
+
+        counts = Counter(term for term in terms if term not in self.vocabulary)
+        words = {}
+        for term, word in pairs:
+            words.setdefault(term, word)
+        missing = [words[term] for term, _ in counts.most_common(MISSING_TERMS)]
+        return SectionCoverage(
+            title=title,
+            page=page,
+            shingles=len(own),
+            coverage=len(covered) / len(own) if own else 1.0,
+            match=match,
+            match_share=match_share,
+            missing=missing,
+        )
+
+
+def section_coverage(original_pages: Iterable[str], tree: ManualNode,
+                     shingle_size: int = 1, furniture: set[str] | None = None) -> list[SectionCoverage]:
+    """Align the sections of a supplier PDF's extracted pages with a parsed rewrite.
+
+    original_pages is the raw text of each page, with its line breaks (see
+    audit_manuals.stream_pdf_pages(raw=True)). With furniture, the page
+    furniture counted on an earlier pass, the pages are read one at a time.
+    Returns one SectionCoverage per original section, in document order.
+    """
+    index = RewriteIndex(rewrite_sections(tree), shingle_size)
+    return [index.cover(section.title, section.page, section.text)
+            for section in split_original(original_pages, furniture)]
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Combined "all tools" binder: several manuals in one PDF, built in one pass.
+
+A ManualBinder lays the manuals out as one document with one stylesheet,
+one canvas and one set of fonts:
+
+    cover           the binder title, the models and the safety notice, once
+    contents        where each part starts
+    shared part     every section or subsection that is identical in two or
+                    more of the manuals, printed once with the models it
+                    applies to
+    one part each   per manual: its title page, then its content, where a
+                    shared section keeps its heading and points to the
+                    shared copy instead of repeating it
+
+Each part switches the running header to its own model and tool name
+(PartLabels) and gets a PDF outline entry. A part is one edition of a
+manual: translated editions of the same model are parts of their own, named
+and anchored by model and locale (edition_name, part_anchor). The binder's
+cover and page labels are in its own locale, and each part's title page in
+the part's.
+
+Page numbers need no extra layout pass. The shared part comes before the
+manuals, so a cross-reference is worded as it is laid out, from the pages
+placed so far (ManualDocTemplate.anchors). The contents page is the one
+forward reference: its rows have a fixed height, and the page numbers are
+drawn in when the document is saved (NumberedCanvas.defer()).
+"""
+
+from collections import OrderedDict
+
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, PageBreak, Spacer
+
+from manual_parser import BODY, SECTION, SUBSECTION
+from manual_inline import escape
+from manual_pdf import FreedomManualPDF, ManualParagraph, locale_text
+
+BINDER_TITLE = 'Cordless Tool Manuals'
+# Running header of the pages that belong to no single manual
+ALL_MODELS = 'ALL MODELS'
+# Container kinds that are shared between manuals when identical
+SHARED_KINDS = (SECTION, SUBSECTION)
+SHARED_ANCHOR = 'shared'
+
+
+def node_signature(node):
+    """Hashable form of a node's kind, text and content (not its source line)."""
+    return (node.kind, node.text, tuple(node_signature(child) for child in node.children))
+
+
+def shared_sections(manuals):
+    """Sections identical in two or more manuals.
+
+    manuals is a list of (model, tree) pairs. Returns an ordered mapping of
+    node signature -> (node, models), in order of first appearance. Only the
+    outermost shared container counts: a shared section's subsections are
+    not listed again.
+    """
+    models = {}
+    for model, tree in manuals:
+        for node in tree.walk():
+            if node.kind in SHARED_KINDS and node.children:
+                models.setdefault(node_signature(node), set()).add(model)
+
+    shared = OrderedDict()
+
+    def collect(nodes):
+        for node in nodes:
+            if node.kind in SHARED_KINDS and node.children:
+                signature = node_signature(node)
+                if len(models[signature]) > 1:
+                    if signature not in shared:
+                        shared[signature] = (node, sorted(models[signature]))
+                    continue
+            collect(node.children)
+
+    for _, tree in manuals:
+        collect(tree.children)
+    return shared
+
+
+def edition_name(model, locale=None):
+    """A part's name in the binder: its model, and its locale if it has one."""
+    return model if locale is None else f"{model} ({locale})"
+
+
+def part_anchor(model, locale=None):
+    return f"part-{model}" if locale is None else f"part-{model}-{locale}"
+
+
+class PartLabels(Flowable):
+    """Zero-size marker that switches the running header to another part.
+
+    NumberedCanvas draws a page's header and footer when the page is
+    finished, so a marker at the top of a page labels that page and every
+    one after it until the next marker. It also bookmarks the page in the
+    PDF outline, under key (default: the model number), which must be
+    unique in the document.
+    """
+
+    def __init__(self, model_number, tool_name, outline=None, key=None):
+        Flowable.__init__(self)
+        self.model_number = model_number
+        self.tool_name = tool_name
+        self.outline = outline
+        self.key = model_number if key is None else key
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        canv = self.canv
+        canv.model_number = self.model_number
+        canv.tool_name = self.tool_name
+        if self.outline and not getattr(canv, 'measure_only', False):
+            key = f"outline-{self.key}"
+            canv.bookmarkPage(key)
+            canv.addOutlineEntry(self.outline, key, level=0)
+
+
+class ContentsTable(Flowable):
+    """The binder's contents: one ruled row per part, page numbers drawn at save.
+
+    The parts come after this page, so their pages are not known while it is
+    laid out. Rows have a fixed height; the labels are drawn in place and the
+    page numbers through NumberedCanvas.defer() once every page is placed.
+    """
+
+    ROW_HEIGHT = 22
+    FONT_SIZE = 11
+    TEXT_COLOR = colors.HexColor('#1a1a1a')
+    RULE_COLOR = colors.HexColor('#cccccc')
+
+    def __init__(self, rows, font_name='Helvetica'):
+        Flowable.__init__(self)
+        # (label, anchor) per row
+        self.rows = rows
+        self.font_name = font_name
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = self.ROW_HEIGHT * len(self.rows)
+        return self.width, self.height
+
+    def _baseline(self, row):
+        return self.height - (row + 1) * self.ROW_HEIGHT + 7
+
+    def draw(self):
+        canv = self.canv
+        canv.setFont(self.font_name, self.FONT_SIZE)
+        canv.setFillColor(self.TEXT_COLOR)
+        canv.setStrokeColor(self.RULE_COLOR)
+        canv.setLineWidth(0.25)
+        for row, (label, _) in enumerate(self.rows):
+            baseline = self._baseline(row)
+            canv.drawString(6, baseline, label)
+            canv.line(0, baseline - 7, self.width, baseline - 7)
+        if not getattr(canv, 'measure_only', False):
+            canv.defer(self._page_numbers(canv._doctemplate.anchors))
+
+    def _page_numbers(self, anchors):
+        def draw(canv):
+            canv.setFont(self.font_name, self.FONT_SIZE)
+            canv.setFillColor(self.TEXT_COLOR)
+            for row, (_, anchor) in enumerate(self.rows):
+                canv.drawRightString(self.width - 6, self._baseline(row), str(anchors.get(anchor, '')))
+        return draw
+
+
+class SharedReference(ManualParagraph):
+    """A manual's pointer to a section printed once in the shared part.
+
+    The shared part comes first, so the section's page is known by the time
+    the reference is laid out; the text is set then. References are one or
+    two lines and are never split.
+    """
+
+    def __init__(self, title, target, style, words=None):
+        self.title = title
+        self.target = target
+        # the binder's locale_text, for the reference's own wording
+        self.words = words or locale_text()
+        self.target_page = None
+        ManualParagraph.__init__(self, self._text(), style)
+        self.block_kind = BODY
+
+    def _text(self):
+        page = ('' if self.target_page is None
+                else self.words['binder_reference_page'].format(page=self.target_page))
+        reference = self.words['binder_shared_reference'].format(title=escape(self.title), page=page)
+        return f"<i>{reference}</i>"
+
+    def wrap(self, availWidth, availHeight):
+        doc = getattr(self.canv, '_doctemplate', None)
+        page = None if doc is None else doc.anchors.get(self.target)
+        if page != self.target_page:
+            self.target_page = page
+            ManualParagraph.__init__(self, self._text(), self.style)
+            self._wrapped_width = None
+        return ManualParagraph.wrap(self, availWidth, availHeight)
+
+    def split(self, availWidth, availHeight):
+        return []
+
+
+class ManualBinder(FreedomManualPDF):
+    """Several manuals rendered into one PDF, with shared sections printed once."""
+
+    def __init__(self, output_filename, title=BINDER_TITLE, profile=None, styles=None, locale=None):
+        FreedomManualPDF.__init__(self, output_filename, ALL_MODELS, title, profile=profile,
+                                  styles=styles, locale=locale)
+        self.title = title
+        # (model, locale, title, tree) per part, in binder order
+        self.manuals = []
+        self.shared = OrderedDict()
+        # signature -> anchor of its copy in the shared part
+        self.shared_anchors = {}
+
+    def add(self, model, title, tree, locale=None):
+        """Add a parsed manual (see manual_parser.load_manual) as the next part.
+
+        locale is the edition's language, for a translated edition.
+        """
+        self.manuals.append((model, locale, title, tree))
+        self.story = []
+
+    def _build_story(self, doc, canvasmaker):
+        if not self.story:
+            self._compose()
+        FreedomManualPDF._build_story(self, doc, canvasmaker)
+
+    def _compose(self):
+        self.shared = shared_sections([(edition_name(model, locale), tree)
+                                       for model, locale, _, tree in self.manuals])
+        self.shared_anchors = {signature: f"{SHARED_ANCHOR}-{i}"
+                               for i, signature in enumerate(self.shared)}
+        self.story = []
+        names = [edition_name(model, locale) for model, locale, _, _ in self.manuals]
+        self.add_cover_page(self.title, ', '.join(names), self.text['binder_subtitle'],
+                            self.text['binder_model_label'])
+
+        self.story.append(ManualParagraph(self.text['binder_contents'], self.styles['MajorSectionHeader']))
+        rows = [(self.text['binder_shared_row'], SHARED_ANCHOR)] if self.shared else []
+        rows += [(f"{edition_name(model, locale)}   {title}", part_anchor(model, locale))
+                 for model, locale, title, _ in self.manuals]
+        self.story.append(ContentsTable(rows, self.styles['BodyText'].fontName))
+
+        if self.shared:
+            self._add_shared_part()
+        for model, locale, title, tree in self.manuals:
+            anchor = part_anchor(model, locale)
+            self.story.append(PageBreak())
+            self.story.append(PartLabels(model, title, outline=f"{edition_name(model, locale)}  {title}",
+                                         key=anchor))
+            self._add_part_title(anchor, title, f"{locale_text(locale)['model_label']} {model}")
+            # A manual that ends in its specifications must not carry them into the next
+            self.in_specs = False
+            self._add_nodes(tree.children, self.shared)
+
+    def _add_part_title(self, anchor, title, subtitle):
+        self.story.append(Spacer(1, 0.4*inch))
+        heading = ManualParagraph(escape(title), self.styles['CoverTitle'])
+        heading.anchor = anchor
+        self.story.append(heading)
+        self.story.append(ManualParagraph(subtitle, self.styles['ModelNumber']))
+
+    def _add_shared_part(self):
+        self.story.append(PageBreak())
+        self.story.append(PartLabels(ALL_MODELS, self.title, outline=self.text['binder_shared_title']))
+        self._add_part_title(SHARED_ANCHOR, self.text['binder_shared_title'],
+                             self.text['binder_shared_subtitle'])
+        self.story.append(ManualParagraph(self.text['binder_shared_intro'], self.styles['BodyText']))
+        self.in_specs = False
+        for signature, (node, models) in self.shared.items():
+            self._add_block(node.kind, node.text)
+            self.story[-1].anchor = self.shared_anchors[signature]
+            applies_to = self.text['binder_applies_to'].format(models=', '.join(models))
+            applies = ManualParagraph(f"<i>{applies_to}</i>", self.styles['BodyText'])
+            applies.block_kind = BODY
+            self.story.append(applies)
+            self._add_nodes(node.children)
+
+    def _add_nodes(self, nodes, shared=None):
+        """Add nodes in source order; shared containers become references."""
+        for node in nodes:
+            self._add_block(node.kind, node.text)
+            signature = node_signature(node) if shared and node.children else None
+            if signature is not None and signature in shared:
+                self.story.append(SharedReference(
+                    node.text, self.shared_anchors[signature], self.styles['BodyText'], self.text))
+                continue
+            self._add_nodes(node.children, shared)
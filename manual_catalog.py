@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Freedom Tools manual catalog.
+
+The single inventory of manuals, shared by the PDF generator, the audit and
+the render server. It lives in manuals.json next to this file:
+
+    {
+      "version": 1,
+      "manuals": [
+        {
+          "model": "FT1001",
+          "title": "18V Cordless Drill",
+          "text_file": "FT1001_Drill_Manual_CONDENSED.txt",
+          "full_text_file": "FT1001_Drill_Manual_REWRITTEN.txt",
+          "output_pdf": "Freedom_FT1001_Drill_Manual_Condensed.pdf",
+          "original_pdf": "18V Cordless Drill manual new(FT1001)(1).pdf"
+        }
+      ]
+    }
+
+original_pdf (the supplier manual the audit compares against) is optional,
+and so is target_pages: the page count the condensed PDF is fitted into (see
+manual_fit).
+
+A manual can also come in other languages. "locales" lists the editions
+besides English ("es", "fr-CA"); each has its own source files and PDF,
+named after the English ones with the locale before the extension
+(FT1001_Drill_Manual_REWRITTEN.es.txt, Freedom_FT1001_..._Condensed.es.pdf).
+"titles" maps a locale to its translated title. localize() turns an entry
+into the entry of one of its editions.
+Relative paths are relative to the catalog file. Loaded entries are plain
+dicts with those paths made absolute, indexed by model and by source file so
+that a subset can be selected by model, glob or changed files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import subprocess
+from collections.abc import Iterable, Iterator
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+CATALOG_FILE = os.path.join(BASE, 'manuals.json')
+CATALOG_VERSION = 1
+
+REQUIRED_FIELDS = ('model', 'title', 'text_file', 'full_text_file', 'output_pdf')
+PATH_FIELDS = ('text_file', 'full_text_file', 'output_pdf', 'original_pdf')
+# Files whose change means the manual has to be rebuilt or re-audited
+SOURCE_FIELDS = ('text_file', 'full_text_file', 'original_pdf')
+# Files each locale has its own version of
+LOCALE_FIELDS = ('text_file', 'full_text_file', 'output_pdf')
+
+# The language of the unsuffixed files
+DEFAULT_LOCALE = 'en'
+_LOCALE_RE = re.compile(r'[a-z]{2,3}(-[A-Z]{2})?\Z')
+
+
+class CatalogError(ValueError):
+    """The catalog file is missing, malformed or inconsistent."""
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class Catalog:
+    """The manuals of a catalog file, in file order, indexed for selection."""
+
+    def __init__(self, manuals: list[dict], path: str | None = None):
+        self.path = path
+        self.manuals = manuals
+        self._by_model = {}
+        self._by_source = {}
+        for manual in manuals:
+            if manual['model'] in self._by_model:
+                raise CatalogError(f"{path}: duplicate model {manual['model']!r}")
+            self._by_model[manual['model']] = manual
+            for field in SOURCE_FIELDS:
+                if manual.get(field):
+                    self._by_source.setdefault(_path_key(manual[field]), []).append(manual)
+            for locale in manual.get('locales', ()):
+                for field in ('text_file', 'full_text_file'):
+                    path = locale_path(manual[field], locale)
+                    self._by_source.setdefault(_path_key(path), []).append(manual)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.manuals)
+
+    def __len__(self) -> int:
+        return len(self.manuals)
+
+    def get(self, model: str) -> dict | None:
+        return self._by_model.get(model)
+
+    def for_file(self, path: str) -> list[dict]:
+        """Manuals built or audited from the given file."""
+        return self._by_source.get(_path_key(path), [])
+
+    def select(self, patterns: Iterable[str] = (), changed: Iterable[str] | None = None) -> list[dict]:
+        """Manuals matching any pattern and/or touched by any changed file.
+
+        A pattern is a model ID or a glob matched against the model and the
+        source file names (FT1001, FT10*, *Drill*). changed is a list of file
+        paths; a changed catalog file selects everything. With neither, the
+        whole catalog is selected. Catalog order is kept.
+        """
+        patterns = list(patterns)
+        if not patterns and changed is None:
+            return list(self.manuals)
+
+        chosen = set()
+        for pattern in patterns:
+            manual = self._by_model.get(pattern)
+            if manual is not None:
+                chosen.add(manual['model'])
+                continue
+            for manual in self.manuals:
+                names = [manual['model']] + [os.path.basename(manual[f])
+                                             for f in SOURCE_FIELDS if manual.get(f)]
+                if any(fnmatch.fnmatch(name, pattern) for name in names):
+                    chosen.add(manual['model'])
+        for path in changed or ():
+            if self.path is not None and _path_key(path) == _path_key(self.path):
+                return list(self.manuals)
+            chosen.update(manual['model'] for manual in self.for_file(path))
+        return [manual for manual in self.manuals if manual['model'] in chosen]
+
+
+def parse_catalog(data: dict, base: str = BASE, path: str | None = None) -> Catalog:
+    """Validate catalog data and resolve its paths against base."""
+    where = path or 'catalog'
+    if not isinstance(data, dict) or not isinstance(data.get('manuals'), list):
+        raise CatalogError(f"{where}: expected an object with a 'manuals' list")
+    if data.get('version', CATALOG_VERSION) != CATALOG_VERSION:
+        raise CatalogError(f"{where}: unsupported catalog version {data.get('version')!r}")
+
+    manuals = []
+    for i, entry in enumerate(data['manuals']):
+        if not isinstance(entry, dict):
+            raise CatalogError(f"{where}: manuals[{i}] is not an object")
+        missing = [field for field in REQUIRED_FIELDS if not entry.get(field)]
+        if missing:
+            raise CatalogError(f"{where}: manuals[{i}] is missing {', '.join(missing)}")
+        target = entry.get('target_pages')
+        if target is not None and (type(target) is not int or target < 1):
+            raise CatalogError(f"{where}: manuals[{i}].target_pages must be a positive integer")
+        locales = entry.get('locales', [])
+        if not isinstance(locales, list) or not all(
+                isinstance(locale, str) and _LOCALE_RE.match(locale) and locale != DEFAULT_LOCALE
+                for locale in locales):
+            raise CatalogError(f"{where}: manuals[{i}].locales must be a list of locale codes "
+                               f"such as \"es\" or \"fr-CA\" (English is implied)")
+        titles = entry.get('titles', {})
+        if not isinstance(titles, dict) or not all(
+                locale in locales and isinstance(title, str) for locale, title in titles.items()):
+            raise CatalogError(f"{where}: manuals[{i}].titles must map listed locales to titles")
+        manual = dict(entry)
+        for field in PATH_FIELDS:
+            if manual.get(field):
+                manual[field] = os.path.join(base, manual[field])
+        manuals.append(manual)
+    return Catalog(manuals, path)
+
+
+def locale_path(path: str, locale: str) -> str:
+    """The file of a locale's edition: the locale goes before the extension."""
+    if locale == DEFAULT_LOCALE:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{locale}{ext}"
+
+
+def localize(manual: dict, locale: str) -> dict:
+    """The catalog entry of one edition of a manual.
+
+    Its source files, output PDF and title are the locale's, and "locale" is
+    set. The supplier original is English, so a translated edition has no
+    original_pdf to audit against. The English edition is the entry itself.
+    """
+    if locale == DEFAULT_LOCALE:
+        return manual
+    if locale not in manual.get('locales', ()):
+        raise CatalogError(f"{manual['model']} has no {locale!r} edition")
+    edition = {field: value for field, value in manual.items() if field != 'original_pdf'}
+    for field in LOCALE_FIELDS:
+        edition[field] = locale_path(manual[field], locale)
+    edition['title'] = manual.get('titles', {}).get(locale, manual['title'])
+    edition['locale'] = locale
+    return edition
+
+
+def editions(manual: dict, locales: Iterable[str] | None = None) -> list[dict]:
+    """The catalog entries of a manual's editions in the given locales (default: all).
+
+    Locales the manual is not published in are skipped.
+    """
+    available = [DEFAULT_LOCALE] + list(manual.get('locales', ()))
+    wanted = available if locales is None else [locale for locale in locales if locale in available]
+    return [localize(manual, locale) for locale in wanted]
+
+
+def load_catalog(path: str = CATALOG_FILE) -> Catalog:
+    """Load a catalog file; relative paths in it are relative to its directory."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except OSError as e:
+        raise CatalogError(f"cannot read catalog {path}: {e.strerror}") from None
+    except ValueError as e:
+        raise CatalogError(f"{path}: invalid JSON: {e}") from None
+    return parse_catalog(data, os.path.dirname(os.path.abspath(path)), path)
+
+
+def changed_files_since(rev: str, cwd: str = BASE) -> list[str]:
+    """Absolute paths of files that differ between git revision rev and the work tree."""
+    try:
+        proc = subprocess.run(
+            ['git', 'diff', '--name-only', '--relative', rev, '--'],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        )
+    except OSError as e:
+        raise CatalogError(f"cannot run git: {e.strerror}") from None
+    except subprocess.CalledProcessError as e:
+        raise CatalogError(f"git diff {rev} failed: {e.stderr.strip()}") from None
+    return [os.path.join(cwd, line) for line in proc.stdout.splitlines() if line]
+
+
+def display_path(path: str) -> str:
+    """A path relative to the working directory when it lies below it."""
+    rel = os.path.relpath(path)
+    return path if rel.startswith(os.pardir) else rel
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def non_negative_float(value: str) -> float:
+    """argparse type for a duration or amount that may be 0 but not less."""
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, not {value}")
+    return number
+
+
+def fraction(value: str) -> float:
+    """argparse type for a share between 0 and 1."""
+    number = float(value)
+    if not 0 <= number <= 1:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1, not {value}")
+    return number
+
+
+def add_selection_arguments(parser) -> None:
+    """The catalog selection options shared by the command-line tools."""
+    parser.add_argument(
+        '--catalog', default=CATALOG_FILE,
+        help="manual catalog file (default: manuals.json next to the scripts)"
+    )
+    parser.add_argument(
+        '-m', '--model', action='append', default=[], metavar='PATTERN',
+        help="only these manuals: a model ID or a glob on model or source file "
+             "name (repeatable)"
+    )
+    parser.add_argument(
+        '--changed', action='append', metavar='FILE',
+        help="only manuals built from this file (repeatable)"
+    )
+    parser.add_argument(
+        '--changed-since', metavar='REV',
+        help="only manuals whose files differ from git revision REV"
+    )
+
+
+def select_from_args(args) -> tuple[Catalog, list[dict]]:
+    """Load the catalog named by the selection options and apply them."""
+    catalog = load_catalog(args.catalog)
+    changed = None
+    if args.changed is not None or args.changed_since:
+        changed = list(args.changed or ())
+        if args.changed_since:
+            changed += changed_files_since(args.changed_since, os.path.dirname(os.path.abspath(args.catalog)))
+    return catalog, catalog.select(args.model, changed)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Page-count fitting for the condensed layout.
+
+fit_manual() finds the largest readable layout that gets a manual into a
+target number of pages. Layouts are points on a single density scale:
+
+    density 0     the stylesheet as designed
+    0 .. 0.5      spacing (spaceBefore/After, box padding) shrinks to MIN_SPACING
+    0.5 .. 1      then font size and leading shrink until body text reaches MIN_FONT_SIZE
+    -1 .. 0       with grow=True, the same steps in reverse: spacing grows to
+                  MAX_SPACING, then fonts to MAX_FONT_SIZE
+
+Page count only goes down as density goes up, so the engine bisects on it.
+Each probe is a FreedomManualPDF.count_pages() layout pass (wrap and split,
+no drawing, no PDF written); a fit typically takes 8-10 of them, the cost of
+three or four full renders. The cover's title styles are left alone.
+"""
+
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from manual_pdf import FreedomManualPDF, get_stylesheet
+
+# Styles of the manual body that fitting resizes
+FIT_STYLES = ('MajorSectionHeader', 'SectionHeader', 'SubsectionHeader', 'ProblemHeader',
+              'BodyText', 'BulletPoint', 'Warning', 'Note')
+# Body text size (pt) the readable range is measured on, and its bounds
+BODY_STYLE = 'BodyText'
+MIN_FONT_SIZE = 7.5
+MAX_FONT_SIZE = 10.5
+# Spacing scale bounds
+MIN_SPACING = 0.4
+MAX_SPACING = 1.5
+# Bisection steps after the end points; 7 resolves density to 1/128
+FIT_STEPS = 7
+
+FitResult = namedtuple('FitResult', [
+    'target', 'pages', 'fits', 'density', 'font_scale', 'spacing_scale',
+    'styles', 'passes', 'seconds',
+])
+FitResult.__doc__ = """Outcome of fit_manual().
+
+fits is False when even the densest layout needs more than target pages;
+styles is then that densest layout, and pages its page count.
+"""
+
+
+def density_scales(density, styles=None):
+    """(font_scale, spacing_scale) of a point on the density scale."""
+    styles = get_stylesheet() if styles is None else styles
+    body = styles[BODY_STYLE].fontSize
+    if density >= 0:
+        spacing = 1 - (1 - MIN_SPACING) * min(1.0, 2 * density)
+        font = 1 - (1 - MIN_FONT_SIZE / body) * max(0.0, 2 * density - 1)
+    else:
+        spacing = 1 + (MAX_SPACING - 1) * min(1.0, -2 * density)
+        font = 1 + (MAX_FONT_SIZE / body - 1) * max(0.0, -2 * density - 1)
+    return font, spacing
+
+
+def scaled_styles(font_scale, spacing_scale, styles=None):
+    """A copy of the style registry with the body styles resized.
+
+    Font size and leading scale together (so line spacing stays
+    proportional); vertical spacing and box padding scale separately.
+    Styles keep their names, so profiles and reports still line up.
+    """
+    styles = get_stylesheet() if styles is None else styles
+    registry = dict(styles)
+    for name in FIT_STYLES:
+        style = styles[name]
+        registry[name] = style.clone(
+            style.name,
+            fontSize=style.fontSize * font_scale,
+            leading=style.leading * font_scale,
+            spaceBefore=style.spaceBefore * spacing_scale,
+            spaceAfter=style.spaceAfter * spacing_scale,
+            borderPadding=style.borderPadding * spacing_scale,
+        )
+    return MappingProxyType(registry)
+
+
+def manual_pdf(tree, model, title, styles=None, output=None, profile=None, locale=None):
+    """A FreedomManualPDF with the cover page and tree added, ready to build or measure."""
+    pdf = FreedomManualPDF(output, model, title, profile=profile, styles=styles, locale=locale)
+    pdf.add_cover_page(title, model)
+    pdf.add_manual(tree)
+    return pdf
+
+
+def fit_manual(tree, model, title, target_pages, grow=False, steps=FIT_STEPS,
+               styles=None, locale=None):
+    """Find the least dense layout of a parsed manual that fits target_pages.
+
+    With grow=True, layouts roomier than the stylesheet are tried too when
+    the manual already fits. styles is the registry to scale (default: the
+    stylesheet; manual_fonts.family_styles() for another font), and locale
+    the language of the cover. Returns a FitResult; pass its styles on to
+    FreedomManualPDF to build the fitted PDF.
+    """
+    if target_pages < 1:
+        raise ValueError(f"target page count must be positive, not {target_pages}")
+    start = time.perf_counter()
+    base = get_stylesheet() if styles is None else styles
+    measured = {}
+
+    def pages_at(density):
+        if density not in measured:
+            styles = scaled_styles(*density_scales(density, base), base)
+            pdf = manual_pdf(tree, model, title, styles, locale=locale)
+            measured[density] = (pdf.count_pages(), styles)
+        return measured[density][0]
+
+    loosest = -1.0 if grow else 0.0
+    if pages_at(loosest) <= target_pages:
+        density = loosest
+    elif pages_at(1.0) > target_pages:
+        density = 1.0
+    else:
+        # pages_at(low) > target_pages >= pages_at(high)
+        low, high = loosest, 1.0
+        for _ in range(steps):
+            middle = (low + high) / 2
+            if pages_at(middle) <= target_pages:
+                high = middle
+            else:
+                low = middle
+        density = high
+
+    pages, styles = measured[density]
+    font_scale, spacing_scale = density_scales(density, base)
+    return FitResult(
+        target=target_pages,
+        pages=pages,
+        fits=pages <= target_pages,
+        density=density,
+        font_scale=font_scale,
+        spacing_scale=spacing_scale,
+        styles=styles,
+        passes=len(measured),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def describe_fit(result):
+    """One-line summary of a FitResult for progress output."""
+    body = get_stylesheet()[BODY_STYLE].fontSize * result.font_scale
+    verdict = 'fits' if result.fits else f"does not fit {result.target}"
+    return (f"{result.pages} pages ({verdict}): body {body:.1f}pt, spacing "
+            f"x{result.spacing_scale:.2f}, {result.passes} layout passes in "
+            f"{result.seconds * 1000:.0f} ms")
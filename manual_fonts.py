@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+TrueType font families for the manual PDFs.
+
+The stylesheet (manual_pdf.get_stylesheet) uses Helvetica, one of the PDF
+base-14 fonts: nothing is embedded, but it only has the Windows-1252
+characters, so ⚠, □ and ✓ come out as blanks and most non-Western text
+cannot be set at all. This module swaps in a TrueType family:
+
+    styles = family_styles('Vera')                      # bundled with ReportLab
+    styles = family_styles('fonts/NotoSans-Regular.ttf', fallbacks=['fonts/NotoSansSymbols2-Regular.ttf'])
+    FreedomManualPDF(path, model, title, styles=styles)
+
+A family is four faces (regular, bold, italic, bold italic); family_from_file
+finds the other three next to the regular one by their usual names
+(-Bold, -Italic/-Oblique, -BoldItalic/-BoldOblique). A missing face falls
+back to the regular one. family_styles() clones every style, replacing the
+Helvetica faces with the family's.
+
+Fallback fonts cover what the family lacks (symbols, other scripts): every
+paragraph is checked against the font it is set in, and each run of
+characters that font has no glyph for is set in the first fallback font that
+has one (GlyphFallback). This also works with Helvetica itself:
+family_styles(None, fallbacks=[...]) keeps Helvetica and only adds symbols.
+
+Fonts are parsed and registered with ReportLab once per process
+(load_family); every later document, locale or build reuses the parsed
+metrics. ReportLab embeds only the glyphs each document uses (a subset per
+document), so one family serves any number of documents.
+"""
+
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+import reportlab
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from manual_pdf import get_stylesheet
+
+FontFamily = namedtuple('FontFamily', 'name regular bold italic bold_italic')
+FontFamily.__doc__ = """A TrueType family: its name and the file of each face (None: use regular)."""
+
+FACES = ('regular', 'bold', 'italic', 'bold_italic')
+# Registered font name suffix per face
+FACE_SUFFIXES = {'regular': '', 'bold': '-Bold', 'italic': '-Italic', 'bold_italic': '-BoldItalic'}
+# The base-14 faces the stylesheet uses, and the face each one stands for
+BASE14_FACES = {
+    'Helvetica': 'regular',
+    'Helvetica-Bold': 'bold',
+    'Helvetica-Oblique': 'italic',
+    'Helvetica-BoldOblique': 'bold_italic',
+}
+# File name endings of the other faces, given the regular one's stem
+_SIBLING_SUFFIXES = {
+    'bold': ('-Bold', 'Bd', '-bold'),
+    'italic': ('-Italic', '-Oblique', 'It', '-italic'),
+    'bold_italic': ('-BoldItalic', '-BoldOblique', 'BI', '-bolditalic'),
+}
+_REGULAR_SUFFIXES = ('-Regular', '-regular', '-Roman')
+FONT_EXTENSIONS = ('.ttf',)
+
+_REPORTLAB_FONTS = os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+
+FONT_FAMILIES = {
+    # Bitstream Vera, shipped with ReportLab: Latin, Greek and Cyrillic accents
+    'Vera': FontFamily(
+        'Vera',
+        os.path.join(_REPORTLAB_FONTS, 'Vera.ttf'),
+        os.path.join(_REPORTLAB_FONTS, 'VeraBd.ttf'),
+        os.path.join(_REPORTLAB_FONTS, 'VeraIt.ttf'),
+        os.path.join(_REPORTLAB_FONTS, 'VeraBI.ttf'),
+    ),
+}
+
+# family name -> {face: registered font name}
+_LOADED = {}
+_LOADED_FILES = {}
+_LOAD_LOCK = threading.Lock()
+# font name -> code points it has glyphs for
+_COVERAGE = {}
+
+
+class FontError(Exception):
+    """A font family that is unknown or cannot be loaded."""
+
+
+def add_font_family(family):
+    """Make a FontFamily available by name to font_family() and family_styles()."""
+    FONT_FAMILIES[family.name] = family
+
+
+def family_from_file(path):
+    """The FontFamily of a regular face's .ttf file and its sibling faces.
+
+    "fonts/NotoSans-Regular.ttf" looks for NotoSans-Bold.ttf, NotoSans-Italic.ttf
+    and NotoSans-BoldItalic.ttf (or -Oblique/-BoldOblique) in the same directory.
+    """
+    if not os.path.isfile(path):
+        raise FontError(f"font file not found: {path}")
+    directory, filename = os.path.split(os.path.abspath(path))
+    stem, ext = os.path.splitext(filename)
+    base = stem
+    for suffix in _REGULAR_SUFFIXES:
+        if stem.endswith(suffix):
+            base = stem[:-len(suffix)]
+            break
+    faces = {'regular': os.path.join(directory, filename)}
+    for face, suffixes in _SIBLING_SUFFIXES.items():
+        faces[face] = next((candidate for suffix in suffixes
+                            for candidate in [os.path.join(directory, base + suffix + ext)]
+                            if os.path.isfile(candidate)), None)
+    return FontFamily(base, **faces)
+
+
+def font_family(spec):
+    """The FontFamily for a family name (FONT_FAMILIES) or a .ttf file path."""
+    if isinstance(spec, FontFamily):
+        return spec
+    if spec in FONT_FAMILIES:
+        return FONT_FAMILIES[spec]
+    if spec.lower().endswith(FONT_EXTENSIONS):
+        return family_from_file(spec)
+    known = ', '.join(sorted(FONT_FAMILIES))
+    raise FontError(f"unknown font family {spec!r}: use one of {known} or a .ttf file")
+
+
+def load_family(family):
+    """Parse and register a family's faces once per process; return {face: font name}.
+
+    Faces without a file of their own map to the regular face's font, so no
+    file is parsed twice.
+    """
+    family = font_family(family)
+    files = tuple(family[1:])
+    with _LOAD_LOCK:
+        if family.name in _LOADED:
+            if _LOADED_FILES[family.name] != files:
+                raise FontError(f"font family {family.name!r} is already loaded from other files")
+            return _LOADED[family.name]
+        names = {}
+        for face in FACES:
+            path = getattr(family, face)
+            if path is None:
+                names[face] = names['regular']
+                continue
+            name = family.name + FACE_SUFFIXES[face]
+            try:
+                pdfmetrics.registerFont(TTFont(name, path))
+            except Exception as e:
+                raise FontError(f"cannot load {path}: {e}") from e
+            names[face] = name
+        for face, name in names.items():
+            addMapping(family.name, 'bold' in face, 'italic' in face, name)
+        _LOADED[family.name] = names
+        _LOADED_FILES[family.name] = files
+        return names
+
+
+def covered_code_points(font_name):
+    """Code points font_name has a glyph for (cached per font)."""
+    points = _COVERAGE.get(font_name)
+    if points is None:
+        font = pdfmetrics.getFont(font_name)
+        face = getattr(font, 'face', None)
+        if hasattr(face, 'charToGlyph'):
+            points = frozenset(face.charToGlyph)
+        else:
+            # Base-14 fonts are set in Windows-1252 (WinAnsiEncoding)
+            points = frozenset(ord(ch) for ch in bytes(range(32, 256)).decode('cp1252', 'ignore'))
+        _COVERAGE[font_name] = points
+    return points
+
+
+class GlyphFallback:
+    """Sets the characters a paragraph's font lacks in fallback fonts.
+
+    A paragraph style carries one as its glyph_fallback attribute (see
+    family_styles); ManualParagraph passes its text through markup().
+    """
+
+    def __init__(self, font_names):
+        self.font_names = tuple(font_names)
+
+    def _fallback_for(self, point):
+        for name in self.font_names:
+            if point in covered_code_points(name):
+                return name
+        return None
+
+    def markup(self, text, font_name):
+        """text with each run of characters font_name lacks wrapped in <font face=...>.
+
+        Markup tags are left alone. Characters no font has are left as they are.
+        """
+        if text.isascii():
+            return text
+        covered = covered_code_points(font_name)
+        out = []
+        run_font = None
+        in_tag = False
+        for ch in text:
+            if in_tag or ch == '<' or ord(ch) < 128 or ord(ch) in covered or ch.isspace():
+                font = None
+            else:
+                font = self._fallback_for(ord(ch))
+            if font != run_font:
+                if run_font is not None:
+                    out.append('</font>')
+                if font is not None:
+                    out.append(f'<font face="{font}">')
+                run_font = font
+            out.append(ch)
+            if ch == '<':
+                in_tag = True
+            elif ch == '>':
+                in_tag = False
+        if run_font is not None:
+            out.append('</font>')
+        return ''.join(out)
+
+
+def family_styles(family=None, fallbacks=(), styles=None):
+    """A copy of a style registry set in a TrueType family.
+
+    family is a FONT_FAMILIES name, a .ttf path or a FontFamily; None keeps
+    Helvetica. fallbacks are fonts (names or .ttf paths; their regular face
+    is used) for the characters the family lacks. styles defaults to
+    get_stylesheet(). Styles registered under several names stay shared.
+    """
+    faces = None if family is None else load_family(family)
+    glyph_fallback = None
+    if fallbacks:
+        glyph_fallback = GlyphFallback(load_family(font)['regular'] for font in fallbacks)
+
+    def face(font_name):
+        if faces is None or font_name not in BASE14_FACES:
+            return font_name
+        return faces[BASE14_FACES[font_name]]
+
+    clones = {}
+    registry = {}
+    for key, style in (get_stylesheet() if styles is None else styles).items():
+        if id(style) not in clones:
+            # List and table styles have only some of these, or none
+            changes = {attr: face(getattr(style, attr)) for attr in ('fontName', 'bulletFontName')
+                       if hasattr(style, attr)}
+            if glyph_fallback is not None and 'fontName' in changes:
+                changes['glyph_fallback'] = glyph_fallback
+            clones[id(style)] = style.clone(style.name, **changes)
+        registry[key] = clones[id(style)]
+    return MappingProxyType(registry)
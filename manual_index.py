@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the manual sources and PDFs.
+
+Every catalog manual contributes up to four sources to one on-disk inverted
+index (.manual_index.json):
+
+    rewrite     the full rewritten text (full_text_file), parsed
+    condensed   the condensed text (text_file), parsed
+    pdf         the generated condensed PDF (output_pdf), once it exists
+    original    the supplier PDF (original_pdf), if the catalog has one
+
+A source is split into passages, and each passage knows where it is: the
+section (and subsection) it belongs to, its source line for text sources and
+its page for PDFs. Parsed sources give one passage per node. A generated
+PDF's pages are cut where the condensed manual's section titles appear;
+supplier PDFs have no known sections, so each page is a passage. Postings
+map every term of a source to the passages that contain it.
+
+The index is kept per source, with the size and mtime of the files it was
+built from, so an update only re-reads sources whose files changed. Text
+comes from manual_parser.load_manual() and PDF text from the audit's cached
+extraction (audit_manuals.stream_pdf_pages), so pypdf is only loaded when a
+PDF actually changed. A query checks those file stats first, so results
+never lag the files on disk:
+
+    python3 manual_index.py build
+    python3 manual_index.py query kickback
+    python3 manual_index.py query -m FT1003 --phrase "wire brush"
+    python3 manual_index.py query 'recycl*' --source original
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable, Sequence
+
+from manual_catalog import BASE, CatalogError, add_selection_arguments, display_path, select_from_args
+from manual_parser import SECTION, SUBSECTION, ManualNode, load_manual, parser_fingerprint
+
+INDEX_FILE = os.path.join(BASE, '.manual_index.json')
+# Bump when the passage split, the tokenizer or the file layout changes
+INDEX_VERSION = 3
+
+# Indexed sources in result order, with the catalog field each is read from
+SOURCES = ('rewrite', 'condensed', 'pdf', 'original')
+SOURCE_FIELDS = {
+    'rewrite': 'full_text_file',
+    'condensed': 'text_file',
+    'pdf': 'output_pdf',
+    'original': 'original_pdf',
+}
+# Characters of context shown around a hit
+SNIPPET_CHARS = 90
+
+# Unicode letters and digits, so "instalación" stays one term
+_TERM_RE = re.compile(r'[^\W_]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def terms(text: str) -> list[str]:
+    """Index terms of a text: lowercase runs of (Unicode) letters and digits.
+
+    "Cut-off" and "100-240V" are split at the hyphen; a --phrase query
+    matches them whole.
+    """
+    return _TERM_RE.findall(text.lower())
+
+
+def _file_stat(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _tree_passages(tree: ManualNode) -> list[tuple[str | None, int | None, int | None, str]]:
+    """(section, page, line, text) of every node of a parsed manual."""
+    passages = []
+
+    def visit(nodes: list[ManualNode], path: list[str]) -> None:
+        for node in nodes:
+            if node.kind == SECTION:
+                here = [node.text]
+            elif node.kind == SUBSECTION:
+                here = path[:1] + [node.text]
+            else:
+                here = path
+            passages.append((' / '.join(here) or None, None, node.line, node.text))
+            visit(node.children, here)
+
+    visit(tree.children, [])
+    return passages
+
+
+def _normalized_offsets(raw: str) -> tuple[str, list[int]]:
+    """audit_manuals.normalize(raw), with the offset in raw of each of its characters."""
+    from audit_manuals import normalize
+
+    chars = []
+    offsets = []
+    for i, ch in enumerate(raw):
+        if _WHITESPACE_RE.match(ch):
+            if not chars or chars[-1] != ' ':
+                chars.append(' ')
+                offsets.append(i)
+            continue
+        for out in normalize(ch):
+            chars.append(out)
+            offsets.append(i)
+    offsets.append(len(raw))
+    return ''.join(chars), offsets
+
+
+def _pdf_passages(pages: Iterable[str], titles: Sequence[str] = ()) -> list[tuple[str | None, int | None, int | None, str]]:
+    """(section, page, line, text) passages of a PDF's raw page texts.
+
+    titles are the section titles expected in the PDF, in order. Each page is
+    cut where the next expected title appears, so a passage never spans two
+    sections; a title that cannot be found just leaves the previous section
+    running. Titles are found in the normalized page; passages keep the text
+    as extracted.
+    """
+    from audit_manuals import normalize
+
+    wanted = [(title, normalize(title).strip()) for title in titles]
+    passages = []
+    section = None
+    k = 0
+    for number, page in enumerate(pages, 1):
+        flat, offsets = _normalized_offsets(page) if k < len(wanted) else ('', [0])
+        start = 0
+        while k < len(wanted):
+            pos = flat.find(wanted[k][1], start)
+            if pos < 0:
+                break
+            cut_from, cut_to = offsets[start], offsets[pos]
+            if page[cut_from:cut_to].strip():
+                passages.append((section, number, None, page[cut_from:cut_to].strip()))
+            section = wanted[k][0]
+            start = pos
+            k += 1
+        rest = page[offsets[start]:]
+        if rest.strip():
+            passages.append((section, number, None, rest.strip()))
+    return passages
+
+
+def source_passages(manual: dict, source: str) -> list[tuple[str | None, int | None, int | None, str]]:
+    """Passages of one source of a catalog manual (empty if its file is missing)."""
+    path = manual.get(SOURCE_FIELDS[source])
+    if not path or not os.path.exists(path):
+        return []
+    if source in ('rewrite', 'condensed'):
+        return _tree_passages(load_manual(path))
+
+    from audit_manuals import stream_pdf_pages
+
+    pages, _ = stream_pdf_pages(path, raw=True)
+    if source == 'pdf':
+        titles = [node.text for node in load_manual(manual['text_file']).children
+                  if node.kind == SECTION]
+        return _pdf_passages(pages, titles)
+    return _pdf_passages(pages)
+
+
+def source_inputs(manual: dict, source: str) -> dict[str, list[int] | None]:
+    """The files a source's passages are read from, with their current stat data."""
+    paths = [manual.get(SOURCE_FIELDS[source])]
+    if source == 'pdf':
+        # Its sections come from the condensed text
+        paths.append(manual['text_file'])
+    return {path: _file_stat(path) for path in paths if path}
+
+
+def index_source(manual: dict, source: str) -> dict:
+    """Index entry of one source: its passages, postings and inputs."""
+    inputs = source_inputs(manual, source)
+    sections = []
+    section_ids = {}
+    passages = []
+    postings = {}
+    for i, (section, page, line, text) in enumerate(source_passages(manual, source)):
+        if section not in section_ids:
+            section_ids[section] = len(sections)
+            sections.append(section)
+        passages.append([section_ids[section], page, line, text])
+        for term in set(terms(text)):
+            postings.setdefault(term, []).append(i)
+    return {
+        'model': manual['model'],
+        'source': source,
+        'path': manual.get(SOURCE_FIELDS[source]),
+        'parser': parser_fingerprint(),
+        'inputs': inputs,
+        'sections': sections,
+        'passages': passages,
+        'postings': postings,
+    }
+
+
+def _entry_key(model: str, source: str) -> str:
+    return f"{model}:{source}"
+
+
+class ManualIndex:
+    """The inverted index of a set of catalog manuals, stored in one JSON file."""
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        # model:source -> index_source() entry
+        self.entries: dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, path: str = INDEX_FILE) -> ManualIndex:
+        """Read an index file; a missing, unreadable or outdated one loads empty."""
+        index = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data['version'] == INDEX_VERSION:
+                index.entries = data['entries']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return index
+
+    def save(self) -> None:
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'entries': self.entries}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def is_fresh(self, manual: dict, source: str) -> bool:
+        entry = self.entries.get(_entry_key(manual['model'], source))
+        return (entry is not None and entry['parser'] == parser_fingerprint()
+                and entry['path'] == manual.get(SOURCE_FIELDS[source])
+                and entry['inputs'] == source_inputs(manual, source))
+
+    def update(self, manuals: list[dict], models: Iterable[str] | None = None,
+               force: bool = False) -> tuple[list[str], dict[str, str]]:
+        """Re-index the sources of manuals whose files changed since they were indexed.
+
+        models, if given, is every model of the catalog: entries of other
+        models are dropped. Returns the keys re-indexed and {key: error} for
+        sources that could not be read (they are retried next time). The
+        file is only rewritten if something changed.
+        """
+        updated = []
+        errors = {}
+        if models is not None:
+            keep = set(models)
+            for key in [key for key, entry in self.entries.items() if entry['model'] not in keep]:
+                del self.entries[key]
+                updated.append(key)
+        for manual in manuals:
+            for source in SOURCES:
+                key = _entry_key(manual['model'], source)
+                if not manual.get(SOURCE_FIELDS[source]):
+                    if self.entries.pop(key, None) is not None:
+                        updated.append(key)
+                    continue
+                if not force and self.is_fresh(manual, source):
+                    continue
+                try:
+                    self.entries[key] = index_source(manual, source)
+                except Exception as e:
+                    errors[key] = f"{type(e).__name__}: {e}"
+                    self.entries.pop(key, None)
+                updated.append(key)
+        if updated:
+            self.save()
+        return updated, errors
+
+    def search(self, query: str, models: Iterable[str] | None = None,
+               sources: Iterable[str] = SOURCES, phrase: bool = False) -> list[dict]:
+        """Passages containing every term of query, in catalog and source order.
+
+        A term ending in * matches any term it starts. With phrase=True the
+        query must also appear verbatim (case and spacing aside). models limits
+        the search to those manuals, in that order.
+        """
+        words = [word for word in query.split() if word.strip('*')]
+        wanted = []
+        for word in words:
+            prefix = word.endswith('*')
+            wanted += [(term, prefix and i == len(terms(word)) - 1)
+                       for i, term in enumerate(terms(word))]
+        if not wanted:
+            return []
+        needle = _WHITESPACE_RE.sub(' ', query.lower().replace('*', '')).strip() if phrase else None
+
+        by_model = {}
+        for entry in self.entries.values():
+            by_model.setdefault(entry['model'], {})[entry['source']] = entry
+        order = list(models) if models is not None else list(by_model)
+        hits = []
+        for model in order:
+            for source in sources:
+                entry = by_model.get(model, {}).get(source)
+                if entry is None:
+                    continue
+                matches = None
+                for term, prefix in wanted:
+                    if prefix:
+                        found = set()
+                        for candidate, postings in entry['postings'].items():
+                            if candidate.startswith(term):
+                                found.update(postings)
+                    else:
+                        found = set(entry['postings'].get(term, ()))
+                    matches = found if matches is None else matches & found
+                    if not matches:
+                        break
+                for i in sorted(matches or ()):
+                    section, page, line, text = entry['passages'][i]
+                    flat = _WHITESPACE_RE.sub(' ', text.lower())
+                    if needle is not None and needle not in flat:
+                        continue
+                    hits.append({
+                        'model': model,
+                        'source': source,
+                        'path': display_path(entry['path']),
+                        'section': entry['sections'][section],
+                        'page': page,
+                        'line': line,
+                        'snippet': snippet(text, needle or wanted[0][0]),
+                    })
+        return hits
+
+
+def snippet(text: str, term: str, width: int = SNIPPET_CHARS) -> str:
+    """About width characters of text around the first occurrence of term."""
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    pos = max(text.lower().find(term), 0)
+    start = max(0, pos - width // 3)
+    end = min(len(text), start + width)
+    return ('…' if start else '') + text[start:end] + ('…' if end < len(text) else '')
+
+
+def format_hit(hit: dict) -> str:
+    where = f"page {hit['page']}" if hit['page'] is not None else f"line {hit['line']}"
+    section = hit['section'] or '-'
+    return f"{hit['model']:<7} {hit['source']:<9} {where:<9} {section}\n          {hit['snippet']}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Search the manual sources and PDFs.")
+    parser.add_argument('--index', default=INDEX_FILE,
+                        help="index file (default: .manual_index.json next to the scripts)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="index new and changed sources")
+    build.add_argument('--force', action='store_true', help="re-index every source")
+    add_selection_arguments(build)
+
+    query = sub.add_parser('query', help="find passages containing every word")
+    query.add_argument('words', nargs='+', help="words to find (a trailing * matches a prefix)")
+    query.add_argument('--phrase', action='store_true',
+                       help="only passages containing the words as one phrase")
+    query.add_argument('--source', action='append', choices=SOURCES,
+                       help="only these sources (repeatable; default: all)")
+    query.add_argument('--limit', type=int, default=50, help="hits to print (0 = all; default: 50)")
+    query.add_argument('--format', choices=('text', 'json'), default='text')
+    query.add_argument('--no-update', action='store_true',
+                       help="search the index as it is, without checking the files for changes")
+    add_selection_arguments(query)
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    try:
+        catalog, manuals = select_from_args(args)
+    except CatalogError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+    index = ManualIndex.load(args.index)
+    models = [manual['model'] for manual in catalog]
+
+    if args.command == 'build':
+        updated, errors = index.update(manuals, models, force=args.force)
+        for key, error in errors.items():
+            print(f"✗ {key}: {error}", file=sys.stderr)
+        passages = sum(len(entry['passages']) for entry in index.entries.values())
+        print(f"✓ {len(updated)} sources re-indexed, {len(index.entries)} indexed "
+              f"({passages} passages) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return 2 if errors else 0
+
+    if not args.no_update:
+        _, errors = index.update(manuals, models)
+        for key, error in errors.items():
+            print(f"✗ {key}: {error}", file=sys.stderr)
+    hits = index.search(' '.join(args.words), [manual['model'] for manual in manuals],
+                        args.source or SOURCES, phrase=args.phrase)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.format == 'json':
+        print(json.dumps(hits, indent=2, ensure_ascii=False))
+        return 0 if hits else 1
+    shown = hits if args.limit <= 0 else hits[:args.limit]
+    for hit in shown:
+        print(format_hit(hit))
+    if len(shown) < len(hits):
+        print(f"... {len(hits) - len(shown)} more (--limit 0 shows all)")
+    print(f"{len(hits)} hits in {elapsed:.0f} ms")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
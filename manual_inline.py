@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Inline text stage: manual source text -> ReportLab paragraph markup.
+
+ReportLab's Paragraph reads its text as markup, but the manual sources are
+plain text. An unescaped "&", "<" or ">" is taken for the start of an entity
+or a tag, so "R&D" prints as "&D;", "&amp" turns into "&" and "<b" starts a
+tag. inline_markup() escapes the three, then adds a small, fixed set of markup
+of its own:
+
+    quantities      the space between a number and its unit ("350 RPM",
+                    "3.5 lbs") becomes non-breaking, so a line never ends
+                    between the two
+    model numbers   FT1001 and the like are set in bold
+    spec values     in a "Label: value" line, the value is set in bold when
+                    label and value are set apart in columns ("Voltage:   18V
+                    DC") or the line is in a specifications section ("KEY
+                    SPECS", "TECHNICAL SPECIFICATIONS"; see spec_section())
+
+Headings get the escaping and the quantities only, since they are bold
+already. Everything is done in one pass of one precompiled pattern, and
+lines with nothing to change (most of them) come back as they are. Results
+are cached by (text, kind), so repeated layouts of the same manual (page
+fitting, --watch, the render server) skip the stage entirely.
+
+The examples in inline_markup() double as its tests:
+
+    python3 -m doctest manual_inline.py
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+
+from manual_parser import BODY, BULLET, CHECKBOX, NOTE, NUMBERED, WARNING
+
+# Block kinds that can be "Label: value" lines of a specification list
+SPEC_KINDS = frozenset((BODY, BULLET))
+# Block kinds that get model numbers in bold (headings are bold throughout)
+MODEL_KINDS = frozenset((BODY, BULLET, NUMBERED, CHECKBOX, NOTE, WARNING))
+# (text, kind) results kept by inline_markup()
+CACHE_SIZE = 8192
+
+NBSP = '\xa0'
+UNITS = ('V', 'Ah', 'W', 'A', 'mm', 'cm', 'in', 'RPM', 'OPM', 'SPM', 'TPI', 'Nm',
+         'lbs', 'lb', 'kg', 'g', '°F', '°C', 'hours', 'hour', 'minutes', 'min', 'seconds')
+
+_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+# Cheap pre-check: a line without any of these characters needs no work at all
+_TRIGGERS = frozenset('&<>:0123456789')
+_INLINE_RE = re.compile(r'''
+      (?P<escape>[&<>])
+    | (?P<model>\b[A-Z]{2}\d{4}\b)
+    | (?P<quantity>\b\d+(?:[.,/]\d+)*(?:[-–]\d+(?:[.,/]\d+)*)?)\ (?P<unit>(?:%s)\b)
+''' % '|'.join(sorted((re.escape(unit) for unit in UNITS), key=len, reverse=True)), re.X)
+# "Voltage:   18V DC", "• Speed: 0–350 RPM": a short label, a gap and a value
+# of one phrase. The value's only periods are decimal points ("3.5") and
+# abbreviations continued in lower case ("Approx. 3.5 lbs").
+_SPEC_RE = re.compile(r'''
+    (?P<label>(?:[•*-]\ )?[A-Za-z][A-Za-z0-9 /()'-]{0,29}:)
+    (?P<gap>\ +)
+    (?P<value>(?:[^.:;!?]|(?<=\d)\.(?=\d)|(?<=[A-Za-z])\.(?=\ +[a-z0-9~(])){1,50})\Z
+''', re.X)
+# Section titles of specification lists
+_SPEC_SECTION_RE = re.compile(r'\bSPEC(?:S|IFICATIONS?)\b', re.I)
+
+
+def escape(text: str) -> str:
+    """text with &, < and > escaped for a Paragraph, and nothing else changed."""
+    if '&' in text or '<' in text or '>' in text:
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return text
+
+
+def _replacer(bold_models: bool):
+    def replace(match: re.Match) -> str:
+        kind = match.lastgroup
+        if kind == 'escape':
+            return _ESCAPES[match.group()]
+        if kind == 'model':
+            return f"<b>{match.group()}</b>" if bold_models else match.group()
+        return f"{match.group('quantity')}{NBSP}{match.group('unit')}"
+    return replace
+
+
+_REPLACE = {True: _replacer(True), False: _replacer(False)}
+
+
+def _inline(text: str, bold_models: bool) -> str:
+    return _INLINE_RE.sub(_REPLACE[bold_models], text)
+
+
+def spec_section(title: str) -> bool:
+    """Whether a section with this title is a specifications list."""
+    return _SPEC_SECTION_RE.search(title) is not None
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def inline_markup(text: str, kind: str = BODY, in_specs: bool = False) -> str:
+    r"""The Paragraph markup for one block of manual source text of the given kind.
+
+    in_specs says the block is in a specifications section, where a single
+    space after the label is enough to make a "Label: value" line a spec.
+
+    >>> inline_markup('R&D <b> & more')
+    'R&amp;D &lt;b&gt; &amp; more'
+    >>> inline_markup('Weight (with battery):       Approx. 3.5 lbs')
+    'Weight (with battery):       <b>Approx. 3.5\xa0lbs</b>'
+    >>> inline_markup('Weight: Approximately 3.5 lbs (with battery)', in_specs=True)
+    'Weight: <b>Approximately 3.5\xa0lbs (with battery)</b>'
+    >>> inline_markup('Tip: 2 hands')
+    'Tip: 2 hands'
+    >>> inline_markup('Note: 5 min')
+    'Note: 5\xa0min'
+    >>> inline_markup('Do it: 2 times. Then stop', in_specs=True)
+    'Do it: 2 times. Then stop'
+    >>> inline_markup('Freedom 18V Cordless Drill (FT1001)', 'checkbox')
+    'Freedom 18V Cordless Drill (<b>FT1001</b>)'
+    """
+    if _TRIGGERS.isdisjoint(text):
+        return text
+    bold_models = kind in MODEL_KINDS
+    if kind in SPEC_KINDS:
+        spec = _SPEC_RE.match(text)
+        if spec is not None and (in_specs or len(spec.group('gap')) > 1):
+            value = spec.group('value').rstrip()
+            return (f"{_inline(spec.group('label'), bold_models)}{spec.group('gap')}"
+                    f"<b>{_inline(value, False)}</b>")
+    return _inline(text, bold_models)
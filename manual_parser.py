@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Freedom Tools manual text parser.
+
+Turns the plain-text manual sources (*_REWRITTEN.txt / *_CONDENSED.txt) into a
+flat stream of tokens (section titles, subsection headings, warnings, notes,
+bullets, ...). Every source line is classified exactly once with precompiled
+patterns; the token pass then only looks at those labels.
+
+Tokens are nested into a ManualNode tree, which load_manual() caches as
+compact JSON next to each source file. The PDF generator and the audit both
+consume that tree, so neither needs to re-scan unchanged text.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+# Line kinds (what a single stripped source line looks like on its own)
+BLANK = 'blank'
+SEPARATOR = 'separator'            # ==========
+DASH_UNDERLINE = 'dash_underline'  # ----- under a title
+HEADER = 'header'                  # decorative text cover lines (FREEDOM TOOLS, MODEL: ...)
+HEADING = 'heading'                # ALL CAPS line
+LABEL = 'label'                    # short line ending with a colon
+PROBLEM = 'problem'
+WARNING = 'warning'
+NOTE = 'note'
+CHECKBOX = 'checkbox'
+BULLET = 'bullet'
+NUMBERED = 'numbered'
+BODY = 'body'
+
+# Token kinds that only exist after looking at neighbouring lines
+SECTION = 'section'
+SUBSECTION = 'subsection'
+
+_SEPARATOR_RE = re.compile(r'={10,}\Z')
+_DASHES_RE = re.compile(r'-{5,}\Z')
+_PREFIX_RE = re.compile(
+    r'(?P<warning>⚠|WARNING)'
+    r'|(?P<note>NOTE:|IMPORTANT:|CAUTION:)'
+    r'|(?P<problem>PROBLEM:)'
+    r'|(?P<checkbox>□)'
+    r'|(?P<bullet>•)'
+    r'|(?P<dash_bullet>- )'
+    r'|(?P<numbered>\d+\.)'
+    r'|(?P<dash>-)'
+)
+
+# Prefixes that keep a line from being styled as a heading
+_ALERT_PREFIXES = frozenset(('warning', 'note', 'problem'))
+_LABEL_EXCLUDED_PREFIXES = _ALERT_PREFIXES | {'bullet', 'checkbox'}
+# Prefixes that start a new block instead of continuing a warning/note
+_BLOCK_PREFIXES = frozenset(
+    ('warning', 'problem', 'checkbox', 'bullet', 'dash_bullet', 'numbered', 'dash')
+)
+
+LineInfo = namedtuple('LineInfo', 'text kind ends_warning ends_note')
+LineInfo.__doc__ = """A classified source line.
+
+text: the stripped line.
+kind: one of the line-kind constants.
+ends_warning / ends_note: whether this line terminates a multi-line warning
+    or note that precedes it instead of being joined onto it.
+"""
+
+ManualToken = namedtuple('ManualToken', 'kind text line')
+ManualToken.__doc__ = """A unit of manual content.
+
+kind: SECTION, SUBSECTION, PROBLEM, WARNING, NOTE, CHECKBOX, BULLET,
+    NUMBERED or BODY.
+text: display text (continuation lines of warnings/notes are joined with
+    spaces; checkbox text has the box glyph removed).
+line: 1-based source line number where the token starts.
+"""
+
+
+def classify_line(line: str) -> LineInfo:
+    """Classify a single source line, ignoring its neighbours."""
+    text = line.strip()
+    if not text:
+        return LineInfo(text, BLANK, True, True)
+
+    m = _PREFIX_RE.match(text)
+    prefix = m.lastgroup if m else None
+    is_upper = text.isupper()
+    is_label = text.endswith(':') and len(text) < 80
+    ends_warning = is_upper or is_label or prefix in _BLOCK_PREFIXES
+    ends_note = ends_warning or prefix == 'note'
+
+    if _SEPARATOR_RE.match(text):
+        kind = SEPARATOR
+    elif ('FREEDOM' in text and 'TOOLS' in text) or text.startswith('MODEL:') \
+            or text == 'INSTRUCTION MANUAL':
+        kind = HEADER
+    elif _DASHES_RE.match(text):
+        kind = DASH_UNDERLINE
+    elif is_upper and len(text) > 3 and prefix not in _ALERT_PREFIXES:
+        kind = HEADING
+    elif prefix == 'problem':
+        kind = PROBLEM
+    elif is_label and prefix not in _LABEL_EXCLUDED_PREFIXES:
+        kind = LABEL
+    elif prefix == 'warning':
+        kind = WARNING
+    elif prefix == 'note':
+        kind = NOTE
+    elif prefix == 'checkbox':
+        kind = CHECKBOX
+    elif prefix in ('bullet', 'dash_bullet'):
+        kind = BULLET
+    elif prefix == 'numbered':
+        kind = NUMBERED
+    else:
+        kind = BODY
+    return LineInfo(text, kind, ends_warning, ends_note)
+
+
+def classify_lines(text_content: str) -> list[LineInfo]:
+    """Classify every line of a manual source."""
+    return [classify_line(line) for line in text_content.split('\n')]
+
+
+def tokenize_manual(text_content: str) -> list[ManualToken]:
+    """Turn manual source text into a list of ManualTokens."""
+    lines = classify_lines(text_content)
+    n = len(lines)
+    tokens = []
+    i = 0
+
+    while i < n:
+        text, kind = lines[i].text, lines[i].kind
+
+        # Major section blocks in the source are formatted as:
+        # ========\nSECTION TITLE\n========
+        if kind == SEPARATOR:
+            j = i + 1
+            while j < n and lines[j].kind == BLANK:
+                j += 1
+            if j >= n:
+                break
+
+            k = j + 1
+            while k < n and lines[k].kind == BLANK:
+                k += 1
+
+            if k < n and lines[k].kind == SEPARATOR:
+                # It's a section block. Only treat it as a "major section" if it isn't part of
+                # the decorative header at the top of the TXT.
+                title = lines[j].text
+                if lines[j].kind != HEADER and not title.startswith('FREEDOM '):
+                    tokens.append(ManualToken(SECTION, title, j + 1))
+                i = k + 1
+                continue
+
+            # Separator line not followed by a proper section block; skip it.
+            i += 1
+            continue
+
+        # Skip blank lines, the text-based cover header and stray dash underlines
+        if kind in (BLANK, HEADER, DASH_UNDERLINE):
+            i += 1
+            continue
+
+        # Title lines followed by dashed underlines are subsection headers,
+        # unless they are warnings/notes/problems
+        if (i + 1 < n and lines[i + 1].kind == DASH_UNDERLINE
+                and kind not in (WARNING, NOTE, PROBLEM)):
+            tokens.append(ManualToken(SUBSECTION, text, i + 1))
+            i += 2
+            continue
+
+        if kind == HEADING:
+            tokens.append(ManualToken(SUBSECTION, text, i + 1))
+        elif kind == LABEL:
+            tokens.append(ManualToken(SUBSECTION, text.rstrip(':').rstrip('-').strip(), i + 1))
+        elif kind in (WARNING, NOTE):
+            # Collect multi-line warnings/notes
+            start = i
+            parts = [text]
+            i += 1
+            ends = 'ends_warning' if kind == WARNING else 'ends_note'
+            while i < n and not getattr(lines[i], ends):
+                parts.append(lines[i].text)
+                i += 1
+            tokens.append(ManualToken(kind, ' '.join(parts), start + 1))
+            continue
+        elif kind == CHECKBOX:
+            tokens.append(ManualToken(CHECKBOX, text[1:].strip(), i + 1))
+        else:
+            # PROBLEM, BULLET, NUMBERED and BODY lines carry their text as-is
+            tokens.append(ManualToken(kind, text, i + 1))
+        i += 1
+
+    return tokens
+
+
+MANUAL = 'manual'
+
+# Node kinds that hold other nodes; everything else is a leaf
+CONTAINER_KINDS = frozenset((MANUAL, SECTION, SUBSECTION, PROBLEM))
+
+# Bump when the tree layout changes in a way the parser source hash would not catch
+AST_VERSION = 1
+AST_CACHE_SUFFIX = '.ast.json'
+
+
+class ManualNode:
+    """A node of a parsed manual.
+
+    The root has kind MANUAL. Sections hold subsections and blocks,
+    subsections hold problems and blocks, and a troubleshooting PROBLEM holds
+    the blocks that follow it. Leaves are WARNING, NOTE, CHECKBOX, BULLET,
+    NUMBERED and BODY nodes. A pre-order walk yields the content in source
+    order.
+    """
+
+    __slots__ = ('kind', 'text', 'line', 'children')
+
+    def __init__(self, kind: str, text: str = '', line: int = 0,
+                 children: list[ManualNode] | None = None):
+        self.kind = kind
+        self.text = text
+        self.line = line
+        self.children = children if children is not None else []
+
+    def __repr__(self) -> str:
+        return f"ManualNode({self.kind!r}, {self.text!r}, line={self.line}, children={len(self.children)})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ManualNode):
+            return NotImplemented
+        return (self.kind, self.text, self.line, self.children) == \
+            (other.kind, other.text, other.line, other.children)
+
+    def walk(self):
+        """Yield every descendant node in source order (pre-order)."""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.children:
+                stack.extend(reversed(node.children))
+
+    def to_list(self) -> list:
+        """Compact JSON-friendly form: [kind, text, line] or [kind, text, line, children]."""
+        if self.kind in CONTAINER_KINDS:
+            return [self.kind, self.text, self.line, [c.to_list() for c in self.children]]
+        return [self.kind, self.text, self.line]
+
+    @classmethod
+    def from_list(cls, data: list) -> ManualNode:
+        children = [cls.from_list(c) for c in data[3]] if len(data) > 3 else None
+        return cls(data[0], data[1], data[2], children)
+
+
+def build_tree(tokens) -> ManualNode:
+    """Nest a token stream into a ManualNode tree."""
+    root = ManualNode(MANUAL)
+    section = subsection = problem = None
+    for token in tokens:
+        node = ManualNode(token.kind, token.text, token.line)
+        if token.kind == SECTION:
+            root.children.append(node)
+            section, subsection, problem = node, None, None
+        elif token.kind == SUBSECTION:
+            (section or root).children.append(node)
+            subsection, problem = node, None
+        elif token.kind == PROBLEM:
+            (subsection or section or root).children.append(node)
+            problem = node
+        else:
+            (problem or subsection or section or root).children.append(node)
+    return root
+
+
+def parse_manual(text_content: str) -> ManualNode:
+    """Parse manual source text into a ManualNode tree."""
+    return build_tree(tokenize_manual(text_content))
+
+
+@functools.lru_cache(maxsize=None)
+def parser_fingerprint() -> str:
+    """Identifies the parser that produced a cached tree."""
+    with open(__file__, 'rb') as f:
+        source_hash = hashlib.sha256(f.read()).hexdigest()
+    return f"{AST_VERSION}:{source_hash}"
+
+
+def ast_cache_path(text_path) -> Path:
+    return Path(text_path).with_suffix(AST_CACHE_SUFFIX)
+
+
+def load_manual(text_path, use_cache: bool = True) -> ManualNode:
+    """Parse a manual source file, reusing the tree cached next to it when valid.
+
+    The cache (<name>.ast.json) records the SHA-256 of the source bytes and the
+    parser fingerprint; if either differs the file is re-parsed and the cache
+    rewritten. Failing to write the cache is not an error.
+    """
+    text_path = Path(text_path)
+    raw = text_path.read_bytes()
+    source_hash = hashlib.sha256(raw).hexdigest()
+    cache_path = ast_cache_path(text_path)
+
+    if use_cache:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['source'] == source_hash and cached['parser'] == parser_fingerprint():
+                return ManualNode.from_list(cached['tree'])
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            pass
+
+    # Match text-mode reading (universal newlines)
+    text = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    tree = parse_manual(text)
+
+    if use_cache:
+        payload = {'parser': parser_fingerprint(), 'source': source_hash, 'tree': tree.to_list()}
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return tree
+
+
+def manual_text(tree: ManualNode) -> str:
+    """Plain text of everything that is rendered from a manual, one node per line."""
+    return '\n'.join(node.text for node in tree.walk())
@@ -0,0 +1,930 @@
+#!/usr/bin/env python3
+"""
+Freedom Tools manual PDF layout.
+
+The ReportLab side of the generator: the shared paragraph styles, the
+numbered page canvas and FreedomManualPDF, which lays a parsed manual out as a
+PDF. Importing this module loads ReportLab; generate_professional_pdfs only
+does so once a manual actually has to be rendered.
+
+FreedomManualPDF.dry_run() paginates a manual without drawing it: the same
+flow/wrap/split logic as a real build, returning a LayoutReport (page count,
+the page each section starts on, and layout problems) instead of a PDF.
+
+The words the layout adds itself (cover, page numbers) come in the languages
+of LOCALE_TEXT; FreedomManualPDF(locale='es') uses the Spanish ones. Fonts
+other than Helvetica come from manual_fonts.
+"""
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, PageBreak, 
+    Table, TableStyle, KeepTogether, Frame, PageTemplate
+)
+from reportlab.platypus.doctemplate import LayoutError
+from reportlab.pdfgen import canvas
+import functools
+import io
+import os
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from types import MappingProxyType
+
+from manual_inline import escape, inline_markup, spec_section
+from manual_parser import (
+    SECTION, SUBSECTION, PROBLEM, WARNING, NOTE, CHECKBOX, BULLET, NUMBERED,
+    tokenize_manual,
+)
+
+# Shared paragraph styles, built on first use by get_stylesheet()
+_STYLES = None
+_STYLES_LOCK = threading.Lock()
+
+# Block kinds a dry run maps to pages, and the headings that must not end a page
+SECTION_KINDS = (SECTION, SUBSECTION)
+HEADING_KINDS = (SECTION, SUBSECTION, PROBLEM)
+# Block kinds drawn as boxes that should stay on one page
+BOX_KINDS = (WARNING, NOTE)
+# A line may run this far (pt) past its space shrinkage before it counts as overflowing
+OVERFLOW_TOLERANCE = 0.5
+
+LayoutReport = namedtuple('LayoutReport', 'pages sections anchors issues complete seconds')
+LayoutReport.__doc__ = """Result of FreedomManualPDF.dry_run().
+
+sections lists a SectionStart per section and subsection heading, in order.
+anchors maps the anchor of every anchored paragraph to the page it starts
+on. issues lists LayoutIssues. complete is False when layout stopped early on a
+flowable too large for the page; pages then counts the pages laid out so far.
+"""
+
+SectionStart = namedtuple('SectionStart', 'kind title page')
+
+LayoutIssue = namedtuple('LayoutIssue', 'problem page kind text detail')
+LayoutIssue.__doc__ = """One layout problem found by a dry run.
+
+problem is one of:
+    'too large'        a flowable that fits on no page (layout stops there)
+    'overflow'         a line wider than the column (a long unbreakable word)
+    'split box'        a warning or note box broken across pages
+    'orphan heading'   a heading left at the bottom of a page
+    'widow line'       the last line of a paragraph alone at the top of a page
+"""
+
+# Stand-in for the "Page x of y" text operator until the page count is known.
+# It is a PDF comment line, so it is harmless if it is ever left in a stream.
+# Each canvas suffixes it with a token of its own, so manual text that happens
+# to contain it is never mistaken for it.
+PAGE_NUMBER_PLACEHOLDER = '% freedom-page-number'
+
+DEFAULT_LOCALE = 'en'
+# The layout's own words per language; a locale without an entry of its own
+# ("fr-CA") uses its language's ("fr"), then English
+LOCALE_TEXT = {
+    'en': {
+        'subtitle': 'INSTRUCTION MANUAL',
+        'model_label': 'MODEL',
+        'binder_subtitle': 'INSTRUCTION MANUALS',
+        'binder_model_label': 'MODELS',
+        'binder_contents': 'CONTENTS',
+        'binder_shared_row': 'Shared information (all tools)',
+        'binder_shared_title': 'Shared Information',
+        'binder_shared_subtitle': 'ALL TOOLS',
+        'binder_shared_intro': "These sections are the same for several tools in this binder and are "
+                               "printed once here. Each manual refers back to them.",
+        'binder_applies_to': 'Applies to: {models}',
+        'binder_shared_reference': 'Same for several tools: see “{title}” in Shared Information{page}.',
+        'binder_reference_page': ', page {page}',
+        'notice': "<b>⚠ IMPORTANT:</b> Please read this manual carefully before using your tool. "
+                  "Keep it in a safe place for future reference. Failure to follow instructions "
+                  "may result in serious injury.",
+        'page_label': 'Page {page} of {count}',
+    },
+    'es': {
+        'subtitle': 'MANUAL DE INSTRUCCIONES',
+        'model_label': 'MODELO',
+        'binder_subtitle': 'MANUALES DE INSTRUCCIONES',
+        'binder_model_label': 'MODELOS',
+        'binder_contents': 'CONTENIDO',
+        'binder_shared_row': 'Información común (todas las herramientas)',
+        'binder_shared_title': 'Información común',
+        'binder_shared_subtitle': 'TODAS LAS HERRAMIENTAS',
+        'binder_shared_intro': "Estas secciones son iguales para varias herramientas de esta carpeta y se "
+                               "imprimen una sola vez aquí. Cada manual remite a ellas.",
+        'binder_applies_to': 'Se aplica a: {models}',
+        'binder_shared_reference': 'Igual para varias herramientas: consulte “{title}” en Información común{page}.',
+        'binder_reference_page': ', página {page}',
+        'notice': "<b>⚠ IMPORTANTE:</b> Lea atentamente este manual antes de usar su herramienta. "
+                  "Guárdelo en un lugar seguro para consultarlo en el futuro. No seguir las "
+                  "instrucciones puede provocar lesiones graves.",
+        'page_label': 'Página {page} de {count}',
+    },
+    'fr': {
+        'subtitle': "MANUEL D'INSTRUCTIONS",
+        'model_label': 'MODÈLE',
+        'binder_subtitle': "MANUELS D'INSTRUCTIONS",
+        'binder_model_label': 'MODÈLES',
+        'binder_contents': 'SOMMAIRE',
+        'binder_shared_row': 'Informations communes (tous les outils)',
+        'binder_shared_title': 'Informations communes',
+        'binder_shared_subtitle': 'TOUS LES OUTILS',
+        'binder_shared_intro': "Ces sections sont identiques pour plusieurs outils de ce classeur et sont "
+                               "imprimées une seule fois ici. Chaque manuel y renvoie.",
+        'binder_applies_to': "S'applique à : {models}",
+        'binder_shared_reference': 'Identique pour plusieurs outils : voir « {title} » dans Informations communes{page}.',
+        'binder_reference_page': ', page {page}',
+        'notice': "<b>⚠ IMPORTANT :</b> Lisez attentivement ce manuel avant d'utiliser votre outil. "
+                  "Conservez-le en lieu sûr pour consultation ultérieure. Le non-respect des "
+                  "instructions peut entraîner des blessures graves.",
+        'page_label': 'Page {page} de {count}',
+    },
+}
+
+
+def locale_text(locale=None):
+    """The layout's words for a locale code ("es", "fr-CA"), falling back to English."""
+    locale = locale or DEFAULT_LOCALE
+    for code in (locale, locale.split('-')[0], DEFAULT_LOCALE):
+        if code in LOCALE_TEXT:
+            return LOCALE_TEXT[code]
+
+
+def profiled(phase):
+    """Record calls of the decorated method as phase in self.profile, if one is set."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profile is None:
+                return method(self, *args, **kwargs)
+            with self.profile.phase(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def flowable_key(flowable):
+    """Profile label of a flowable: its type, plus the style name for paragraphs."""
+    name = 'Paragraph' if isinstance(flowable, Paragraph) else type(flowable).__name__
+    style = getattr(getattr(flowable, 'style', None), 'name', None)
+    return f"{name}/{style}" if style else name
+
+
+class ManualParagraph(Paragraph):
+    """Paragraph that keeps its line breaks between wraps at the same width.
+
+    Platypus wraps a paragraph several times per build (keepWithNext groups,
+    KeepTogether, split attempts, then the final placement), almost always at
+    the frame width, and breaking lines is the costliest part of layout. The
+    result depends on nothing but the width, so it is reused. On a canvas
+    with measure_only set the paragraph is laid out but never drawn.
+    """
+
+    _wrapped_width = None
+    # The manual block (manual_parser kind) this paragraph shows, and for the
+    # parts of a split paragraph, the paragraph they were split from
+    block_kind = None
+    origin = None
+    # Name under which a dry run reports the page this paragraph starts on
+    anchor = None
+
+    def __init__(self, text, style=None, *args, **kwargs):
+        # Styles from manual_fonts.family_styles() may set missing glyphs in other fonts
+        fallback = getattr(style, 'glyph_fallback', None)
+        if fallback is not None and text:
+            text = fallback.markup(text, style.fontName)
+        Paragraph.__init__(self, text, style, *args, **kwargs)
+
+    def wrap(self, availWidth, availHeight):
+        # split() drops blPara when it gives up on a paragraph; wrap again then
+        if availWidth == self._wrapped_width and 'blPara' in self.__dict__:
+            return self.width, self.height
+        size = Paragraph.wrap(self, availWidth, availHeight)
+        # Paragraph.wrap bails out early (without breaking lines) on tiny widths
+        self._wrapped_width = availWidth if self.width == availWidth else None
+        return size
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        if not getattr(canvas, 'measure_only', False):
+            Paragraph.drawOn(self, canvas, x, y, _sW)
+
+    def split(self, availWidth, availHeight):
+        parts = Paragraph.split(self, availWidth, availHeight)
+        for part in parts:
+            part.block_kind = self.block_kind
+            part.anchor = self.anchor
+            part.origin = self.origin or self
+        return parts
+
+    def overflow(self):
+        """How far (pt) the worst line runs past the column, or 0.
+
+        Line breaking lets the spaces of a line shrink a little, so lines may
+        legitimately run over by that much; only the excess counts.
+        """
+        lines = getattr(self, 'blPara', None)
+        if lines is None:
+            return 0
+        style = self.style
+        shrink = style.spaceShrinkage * stringWidth(' ', style.fontName, style.fontSize)
+        worst = 0
+        for line in lines.lines:
+            if lines.kind == 0:
+                extra, words = line[0], len(line[1])
+            else:
+                extra, words = line.extraSpace, line.wordCount
+            worst = max(worst, -extra - shrink * max(0, words - 1))
+        return worst
+
+    def line_count(self):
+        lines = getattr(self, 'blPara', None)
+        return 0 if lines is None else len(lines.lines)
+
+
+class _LayoutTracker:
+    """Follows a dry run's placements (doc.afterFlowable) and collects a LayoutReport."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.sections = []
+        self.issues = []
+        self.complete = True
+        # origin paragraph -> page its first part went on
+        self._first_page = {}
+        self._split_boxes = set()
+        self._last = None
+        self._last_page = 0
+
+    def placed(self, flowable):
+        if not isinstance(flowable, ManualParagraph):
+            return
+        page = self.doc.page
+        if flowable.block_kind is None:
+            return
+        kind = flowable.block_kind
+        origin = flowable.origin or flowable
+        first_page = self._first_page.setdefault(origin, page)
+
+        if self._last is not None and page > self._last_page \
+                and self._last.block_kind in HEADING_KINDS and origin is not self._last:
+            self.issue('orphan heading', self._last_page, self._last)
+        if origin is flowable and kind in SECTION_KINDS:
+            self.sections.append(SectionStart(kind, flowable.getPlainText().strip(), page))
+        if page > first_page:
+            if kind in BOX_KINDS:
+                if origin not in self._split_boxes:
+                    self._split_boxes.add(origin)
+                    self.issue('split box', first_page, origin, f"continues on page {page}")
+            elif flowable.line_count() == 1:
+                self.issue('widow line', page, flowable)
+        overflow = flowable.overflow()
+        if overflow > OVERFLOW_TOLERANCE:
+            self.issue('overflow', page, flowable, f"{overflow:.1f}pt past the column")
+        self._last, self._last_page = flowable, page
+
+    def too_large(self, error):
+        self.complete = False
+        self.issues.append(LayoutIssue('too large', self.doc.page, None, '', str(error)))
+
+    def issue(self, problem, page, flowable, detail=''):
+        text = flowable.getPlainText().strip()
+        self.issues.append(LayoutIssue(problem, page, flowable.block_kind, text, detail))
+
+    def report(self, seconds):
+        return LayoutReport(self.doc.page, self.sections, dict(self.doc.anchors), self.issues,
+                            self.complete, seconds)
+
+
+class ManualDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate that keeps track of where anchored paragraphs land.
+
+    anchors (anchor -> page) fills in as the story is laid out, so a
+    flowable can look up the page of an earlier one while it is laid out
+    (through canv._doctemplate). on_flowable, if set, is called with every
+    flowable placed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        SimpleDocTemplate.__init__(self, *args, **kwargs)
+        self.anchors = {}
+        self.on_flowable = None
+
+    def afterFlowable(self, flowable):
+        anchor = getattr(flowable, 'anchor', None)
+        if anchor is not None:
+            self.anchors.setdefault(anchor, self.page)
+        if self.on_flowable is not None:
+            self.on_flowable(flowable)
+
+
+class MeasuringCanvas(canvas.Canvas):
+    """Canvas for layout-only passes: pages are counted, nothing is drawn or saved."""
+
+    measure_only = True
+
+    def __init__(self, *args, **kwargs):
+        canvas.Canvas.__init__(self, *args)
+
+    def save(self):
+        pass
+
+
+class NumberedCanvas(canvas.Canvas):
+    """Custom canvas that adds page numbers and headers/footers.
+
+    Pages are decorated and handed to the PDF document as soon as they are
+    finished. The total page count is only known in save(), so each page
+    carries a placeholder where "Page x of y" goes; save() swaps in the real
+    text. Only (page, page number) pairs are kept in the meantime.
+
+    font_name sets the header and footer font; page_label is the page number
+    text, formatted with page and count.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        canvas.Canvas.__init__(self, *args, **kwargs)
+        self._numbered_pages = []
+        self._placeholder_token = uuid.uuid4().hex
+        self._page_number_placeholder = f"{PAGE_NUMBER_PLACEHOLDER}-{self._placeholder_token}"
+        # (placeholder, draw) deferred on the current page, then per finished page
+        self._deferred = []
+        self._deferred_pages = []
+        self.model_number = kwargs.get('model_number', '')
+        self.tool_name = kwargs.get('tool_name', '')
+        self.font_name = kwargs.get('font_name', 'Helvetica')
+        self.page_label = kwargs.get('page_label', 'Page {page} of {count}')
+        # Optional build_profile.BuildProfile receiving decoration/write timings
+        self.profile = kwargs.get('profile')
+        
+    def showPage(self):
+        page_num = self._pageNumber
+        self.draw_page_decorations(None)
+        canvas.Canvas.showPage(self)
+        if page_num != 1:
+            self._numbered_pages.append((self._doc.Pages.pages[-1], page_num))
+        if self._deferred:
+            self._deferred_pages.append((self._doc.Pages.pages[-1], self._deferred))
+            self._deferred = []
+        
+    def save(self):
+        """Add page info to each page (page x of y)"""
+        if self._code:
+            self.showPage()
+        num_pages = self._pageNumber - 1
+        for page, page_num in self._numbered_pages:
+            page.stream = page.stream.replace(
+                self._page_number_placeholder, self._page_number_code(page_num, num_pages), 1
+            )
+        self._numbered_pages = []
+        for page, deferred in self._deferred_pages:
+            for placeholder, draw in deferred:
+                page.stream = page.stream.replace(placeholder, self._deferred_code(draw), 1)
+        self._deferred_pages = []
+        if self.profile is None:
+            canvas.Canvas.save(self)
+        else:
+            with self.profile.phase('write'):
+                canvas.Canvas.save(self)
+    
+    @profiled('page numbers')
+    def _page_number_code(self, page_num, page_count):
+        """Render the page number text operator exactly as it is drawn in place."""
+        code, self._code = self._code, []
+        self.saveState()
+        self.setFont(self.font_name, 9)
+        start = len(self._code)
+        self.draw_page_number(page_num, page_count)
+        page_code = ' '.join(self._code[start:])
+        self.restoreState()
+        self._code = code
+        return page_code
+    
+    def defer(self, draw):
+        """Call draw(canvas) in save(), once every page is laid out.
+
+        What it draws goes here, in the current coordinate system, like the
+        page numbers do: for content that depends on later pages, such as a
+        contents page.
+        """
+        placeholder = f"% freedom-deferred-{self._placeholder_token}-{len(self._deferred)}"
+        self._code.append(placeholder)
+        self._deferred.append((placeholder, draw))
+    
+    def _deferred_code(self, draw):
+        code, self._code = self._code, []
+        self.saveState()
+        draw(self)
+        self.restoreState()
+        deferred_code, self._code = ' '.join(self._code), code
+        return deferred_code
+    
+    def draw_page_number(self, page_num, page_count):
+        """Draw "Page x of y" centered in the footer."""
+        page_text = self.page_label.format(page=page_num, count=page_count)
+        text_width = self.stringWidth(page_text, self.font_name, 9)
+        self.drawString((letter[0] - text_width) / 2, 0.5*inch, page_text)
+        
+    @profiled('decoration')
+    def draw_page_decorations(self, page_count):
+        """Draw headers, footers, and page numbers.
+
+        A page_count of None leaves a placeholder for save() to fill in.
+        """
+        page_num = self._pageNumber
+        
+        # Skip decorations on cover page (page 1)
+        if page_num == 1:
+            return
+            
+        # Header
+        self.saveState()
+        self.setFont(self.font_name, 9)
+        self.setFillColor(colors.HexColor('#666666'))
+        
+        # Left side - Brand and model
+        self.drawString(0.75*inch, letter[1] - 0.5*inch, 
+                       f"FREEDOM TOOLS  |  {self.model_number}")
+        
+        # Right side - Tool name
+        text_width = self.stringWidth(self.tool_name, self.font_name, 9)
+        self.drawString(letter[0] - 0.75*inch - text_width, 
+                       letter[1] - 0.5*inch, 
+                       self.tool_name)
+        
+        # Header line
+        self.setStrokeColor(colors.HexColor('#0066cc'))
+        self.setLineWidth(0.5)
+        self.line(0.75*inch, letter[1] - 0.55*inch, 
+                 letter[0] - 0.75*inch, letter[1] - 0.55*inch)
+        
+        # Footer line
+        self.line(0.75*inch, 0.65*inch, 
+                 letter[0] - 0.75*inch, 0.65*inch)
+        
+        # Page number - centered
+        if page_count is None:
+            self._code.append(self._page_number_placeholder)
+        else:
+            self.draw_page_number(page_num, page_count)
+        
+        # Copyright - left side
+        self.setFont(self.font_name, 8)
+        self.drawString(0.75*inch, 0.5*inch, 
+                       f"© {datetime.now().year} Freedom Tools")
+        
+        # Empty space on right side (no contact info)
+        
+        self.restoreState()
+
+
+def _build_styles():
+    """Create custom paragraph styles for consistent formatting."""
+    styles = getSampleStyleSheet()
+    
+    def add_style_if_not_exists(name, style):
+        if name not in styles:
+            styles.add(style)
+    
+    # Cover page styles
+    add_style_if_not_exists('CoverBrand', ParagraphStyle(
+        name='CoverBrand',
+        parent=styles['Heading1'],
+        fontSize=32,
+        textColor=colors.HexColor('#0066cc'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold',
+        letterSpacing=2
+    ))
+    
+    add_style_if_not_exists('CoverTitle', ParagraphStyle(
+        name='CoverTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    add_style_if_not_exists('ModelNumber', ParagraphStyle(
+        name='ModelNumber',
+        parent=styles['Normal'],
+        fontSize=18,
+        textColor=colors.HexColor('#0066cc'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    add_style_if_not_exists('CoverSubtitle', ParagraphStyle(
+        name='CoverSubtitle',
+        parent=styles['Normal'],
+        fontSize=16,
+        textColor=colors.HexColor('#666666'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica'
+    ))
+    
+    # Major section header style (top-level sections surrounded by ===== lines in source)
+    add_style_if_not_exists('MajorSectionHeader', ParagraphStyle(
+        name='MajorSectionHeader',
+        parent=styles['Heading1'],
+        fontSize=14,
+        textColor=colors.HexColor('#ffffff'),
+        spaceAfter=12,
+        spaceBefore=14,
+        fontName='Helvetica-Bold',
+        backColor=colors.HexColor('#004a99'),
+        leftIndent=12,
+        rightIndent=12,
+        borderPadding=8,
+        keepWithNext=1
+    ))
+
+    # Section header style
+    add_style_if_not_exists('SectionHeader', ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading1'],
+        fontSize=13,
+        textColor=colors.HexColor('#ffffff'),
+        spaceAfter=14,
+        spaceBefore=24,
+        fontName='Helvetica-Bold',
+        backColor=colors.HexColor('#0066cc'),
+        leftIndent=12,
+        rightIndent=12,
+        borderPadding=8
+    ))
+    
+    # Subsection header style
+    add_style_if_not_exists('SubsectionHeader', ParagraphStyle(
+        name='SubsectionHeader',
+        parent=styles['Heading2'],
+        fontSize=11,
+        textColor=colors.HexColor('#0066cc'),
+        spaceAfter=8,
+        spaceBefore=14,
+        fontName='Helvetica-Bold',
+        borderWidth=0,
+        borderPadding=0,
+        leftIndent=0,
+        keepWithNext=1
+    ))
+    
+    # Problem header style for troubleshooting
+    add_style_if_not_exists('ProblemHeader', ParagraphStyle(
+        name='ProblemHeader',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=4,
+        spaceBefore=12,
+        fontName='Helvetica-Bold',
+        leftIndent=0
+    ))
+    
+    # Body text style
+    add_style_if_not_exists('BodyText', ParagraphStyle(
+        name='BodyText',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=6,
+        alignment=TA_LEFT,
+        fontName='Helvetica',
+        leading=12
+    ))
+    
+    # Bullet point style
+    add_style_if_not_exists('BulletPoint', ParagraphStyle(
+        name='BulletPoint',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=4,
+        leftIndent=24,
+        bulletIndent=12,
+        fontName='Helvetica',
+        leading=12
+    ))
+    
+    # Warning style
+    add_style_if_not_exists('Warning', ParagraphStyle(
+        name='Warning',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#cc0000'),
+        spaceAfter=10,
+        spaceBefore=10,
+        fontName='Helvetica-Bold',
+        backColor=colors.HexColor('#fff5f5'),
+        borderWidth=2,
+        borderColor=colors.HexColor('#cc0000'),
+        borderPadding=10,
+        leading=12,
+        leftIndent=12,
+        rightIndent=12
+    ))
+    
+    # Note style
+    add_style_if_not_exists('Note', ParagraphStyle(
+        name='Note',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#0066cc'),
+        spaceAfter=10,
+        spaceBefore=10,
+        fontName='Helvetica-Bold',
+        backColor=colors.HexColor('#f0f8ff'),
+        borderWidth=2,
+        borderColor=colors.HexColor('#0066cc'),
+        borderPadding=10,
+        leading=12,
+        leftIndent=12,
+        rightIndent=12
+    ))
+    
+    # Footer style
+    add_style_if_not_exists('Footer', ParagraphStyle(
+        name='Footer',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#666666'),
+        alignment=TA_CENTER,
+        fontName='Helvetica',
+        leading=14
+    ))
+    
+    registry = dict(styles.byAlias)
+    registry.update(styles.byName)
+    return registry
+
+
+def get_stylesheet():
+    """Return the shared paragraph style registry.
+
+    The registry is built once per process on first use (forked workers
+    inherit it) and is a read-only mapping, so any number of documents and
+    threads can use it concurrently. The styles themselves are shared too:
+    derive a variant with style.clone(name, **overrides) instead of changing
+    one in place.
+    """
+    global _STYLES
+    if _STYLES is None:
+        with _STYLES_LOCK:
+            if _STYLES is None:
+                _STYLES = MappingProxyType(_build_styles())
+    return _STYLES
+
+
+class FreedomManualPDF:
+    """Generate professional PDF manuals for Freedom Tools."""
+    
+    # Canvas used for every page; subclasses may swap in a NumberedCanvas subclass
+    canvas_class = NumberedCanvas
+    
+    def __init__(self, output_filename, model_number, tool_name, profile=None, styles=None,
+                 locale=None):
+        self.output_filename = output_filename
+        self.model_number = model_number
+        self.tool_name = tool_name
+        self.story = []
+        # A style registry like get_stylesheet()'s; manual_fit passes resized ones
+        self.styles = get_stylesheet() if styles is None else styles
+        # Layout mode: 'full' prioritizes whitespace and clarity; 'condensed' is compact
+        # (manual_fit shrinks it further to meet a page target).
+        self.layout_mode = 'condensed'
+        # Optional build_profile.BuildProfile; None keeps every build uninstrumented
+        self.profile = profile
+        # Language of the manual (None: English); picks the words of locale_text()
+        self.locale = locale
+        self.text = locale_text(locale)
+        # Whether the blocks being added are in a specifications section
+        self.in_specs = False
+        
+    @profiled('cover')
+    def add_cover_page(self, title, model, subtitle=None, model_label=None):
+        """Add a professional cover page."""
+        if subtitle is None:
+            subtitle = self.text['subtitle']
+        if model_label is None:
+            model_label = self.text['model_label']
+        # Add space from top
+        self.story.append(Spacer(1, 1.8*inch))
+        
+        # Brand name
+        brand = ManualParagraph("FREEDOM", self.styles['CoverBrand'])
+        self.story.append(brand)
+        self.story.append(Spacer(1, 0.1*inch))
+        
+        # Product title
+        title_para = ManualParagraph(escape(title), self.styles['CoverTitle'])
+        self.story.append(title_para)
+        self.story.append(Spacer(1, 0.3*inch))
+        
+        # Model number
+        model_para = ManualParagraph(escape(f"{model_label} {model}"), self.styles['ModelNumber'])
+        self.story.append(model_para)
+        self.story.append(Spacer(1, 0.6*inch))
+        
+        # Subtitle
+        subtitle_para = ManualParagraph(subtitle, self.styles['CoverSubtitle'])
+        self.story.append(subtitle_para)
+        self.story.append(Spacer(1, 1.2*inch))
+        
+        # Important notice
+        notice = ManualParagraph(self.text['notice'], self.styles['Warning'])
+        self.story.append(notice)
+        
+        # Add page break
+        self.story.append(PageBreak())
+    
+    def parse_and_add_content(self, text_content):
+        """Parse text file and add formatted content to PDF."""
+        if self.profile is None:
+            for token in tokenize_manual(text_content):
+                self._add_block(token.kind, token.text)
+            return
+        with self.profile.phase('parse'):
+            tokens = tokenize_manual(text_content)
+        for token in tokens:
+            with self.profile.phase(f"story:{token.kind}"):
+                self._add_block(token.kind, token.text)
+    
+    def add_manual(self, tree):
+        """Add formatted content from a parsed manual (see manual_parser.load_manual)."""
+        if self.profile is None:
+            for node in tree.walk():
+                self._add_block(node.kind, node.text)
+            return
+        for node in tree.walk():
+            with self.profile.phase(f"story:{node.kind}"):
+                self._add_block(node.kind, node.text)
+    
+    def _add_block(self, kind, text):
+        """Append the flowable for one token or tree node to the story."""
+        # Source text is plain text; make it paragraph markup (see manual_inline)
+        if kind == SECTION:
+            self.in_specs = spec_section(text)
+        text = inline_markup(text, kind, self.in_specs)
+        # Major sections intentionally get no forced page breaks (page count explodes);
+        # keepWithNext on the header style prevents orphaned headings at page bottom.
+        if kind == SECTION:
+            paragraph = ManualParagraph(text, self.styles['MajorSectionHeader'])
+        elif kind == SUBSECTION:
+            paragraph = ManualParagraph(text, self.styles['SubsectionHeader'])
+        elif kind == PROBLEM:
+            paragraph = ManualParagraph(text, self.styles['ProblemHeader'])
+        elif kind == WARNING:
+            paragraph = ManualParagraph(text.replace('⚠', '⚠ '), self.styles['Warning'])
+        elif kind == NOTE:
+            paragraph = ManualParagraph(text, self.styles['Note'])
+        elif kind == CHECKBOX:
+            paragraph = ManualParagraph(f"• {text}", self.styles['BulletPoint'])
+        elif kind in (BULLET, NUMBERED):
+            paragraph = ManualParagraph(text, self.styles['BulletPoint'])
+        else:
+            paragraph = ManualParagraph(text, self.styles['BodyText'])
+        paragraph.block_kind = kind
+        # Warning and note boxes are kept on one page where possible
+        self.story.append(KeepTogether(paragraph) if kind in BOX_KINDS else paragraph)
+    
+    @profiled('footer')
+    def add_footer_page(self):
+        """Add a final footer page with company information."""
+        self.story.append(PageBreak())
+        self.story.append(Spacer(1, 3*inch))
+        
+        footer_text = f"""
+        <para align=center>
+        <b><font size=16 color="#0066cc">FREEDOM TOOLS</font></b><br/>
+        <font size=12>Built for Performance, Designed for You</font><br/>
+        <br/>
+        <br/>
+        <br/>
+        <font size=9 color="#666666">© {datetime.now().year} Freedom Tools. All rights reserved.<br/>
+        Specifications subject to change without notice.</font>
+        </para>
+        """
+        
+        footer = ManualParagraph(footer_text, self.styles['Footer'])
+        self.story.append(footer)
+    
+    def build(self, output=None):
+        """Build the PDF document with custom canvas.
+
+        output is where the PDF goes: a filename/path, or any writable binary
+        stream (an HTTP response, a zip entry, a BytesIO, ...), which receives
+        the finished document in a single write. Defaults to output_filename.
+        """
+        target = self.output_filename if output is None else output
+        if isinstance(target, os.PathLike):
+            target = os.fspath(target)
+        doc = self._doc_template(target)
+        
+        # Build with custom canvas that adds page numbers
+        self._build_story(
+            doc,
+            canvasmaker=lambda *args, **kwargs: self.canvas_class(
+                *args, 
+                model_number=self.model_number,
+                tool_name=self.tool_name,
+                profile=self.profile,
+                **self._canvas_options(),
+                **kwargs
+            )
+        )
+        if isinstance(target, str):
+            print(f"✓ PDF created successfully: {target}")
+    
+    def _canvas_options(self):
+        """Header/footer font and page number label."""
+        return {'font_name': self.styles['Footer'].fontName, 'page_label': self.text['page_label']}
+
+    def dry_run(self):
+        """Paginate the story without drawing it or producing a PDF; return a LayoutReport.
+
+        Runs the same flow/wrap/split logic as build(), so page numbers match
+        the rendered PDF, at a fraction of the cost. Nothing is written.
+        """
+        start = time.perf_counter()
+        doc = self._doc_template(io.BytesIO())
+        tracker = _LayoutTracker(doc)
+        doc.on_flowable = tracker.placed
+        try:
+            self._build_story(doc, canvasmaker=MeasuringCanvas)
+        except LayoutError as e:
+            tracker.too_large(e)
+        return tracker.report(time.perf_counter() - start)
+    
+    def count_pages(self):
+        """Lay the story out without drawing or writing anything; return the page count."""
+        doc = self._doc_template(io.BytesIO())
+        self._build_story(doc, canvasmaker=MeasuringCanvas)
+        return doc.page
+    
+    def _doc_template(self, target):
+        doc = ManualDocTemplate(
+            target,
+            pagesize=letter,
+            rightMargin=0.6*inch,
+            leftMargin=0.6*inch,
+            topMargin=0.6*inch,
+            bottomMargin=0.6*inch
+        )
+        if self.locale is not None:
+            # Declared in the PDF catalog for screen readers and search
+            doc.lang = self.locale
+        return doc
+    
+    def _build_story(self, doc, canvasmaker):
+        """Flow a copy of the story through doc, leaving the story reusable.
+
+        Platypus marks flowables while laying them out (_postponed,
+        keepWithNext); those edits are recorded the way multiBuild does and
+        undone afterwards so the same story can be built again.
+        """
+        edits = []
+        doc._multiBuildEdits = edits.append
+        try:
+            if self.profile is None:
+                doc.build(list(self.story), canvasmaker=canvasmaker)
+            else:
+                self._profile_layout(doc)
+                with self.profile.phase('build'):
+                    doc.build(list(self.story), canvasmaker=canvasmaker)
+        finally:
+            del doc._multiBuildEdits
+            for edit in edits:
+                edit[0](*edit[1:])
+    
+    def _profile_layout(self, doc):
+        """Count the story's flowables and time doc's layout of each one by type."""
+        for flowable in self.story:
+            self.profile.count_flowable(flowable_key(flowable))
+            if isinstance(flowable, KeepTogether):
+                for inner in flowable._content:
+                    self.profile.count_flowable(flowable_key(inner))
+        
+        handle_flowable = doc.handle_flowable
+        profile = self.profile
+        
+        def profiled_handle_flowable(flowables):
+            with profile.phase(f"layout:{flowable_key(flowables[0])}"):
+                handle_flowable(flowables)
+        
+        doc.handle_flowable = profiled_handle_flowable
+    
+    def build_bytes(self):
+        """Build the PDF in memory and return it as bytes."""
+        out = io.BytesIO()
+        self.build(out)
+        return out.getvalue()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Freedom Tools manual render server.
+
+Keeps ReportLab, the shared paragraph styles and font metrics warm in one
+long-running process and renders manuals on demand over a small local HTTP API:
+
+    GET  /health            -> 200 "ok"
+    GET  /manuals           -> JSON list of known models and titles
+    POST /render            -> application/pdf
+
+The /render body is JSON: either {"model": "FT1001"} to render a catalog
+manual, or {"text": "...", "model": "...", "title": "..."} to render supplied
+manual text. "layout" is "condensed" (default) or "full" and only selects
+the catalog source, the condensed or the full rewrite; supplied text is
+rendered as it is, so "layout" does not affect it. A catalog manual is built
+as generate_professional_pdfs.py builds it: with its font and, for the
+condensed layout, fitted to its target_pages. "locale" ("es") selects one of
+its translated editions.
+
+    python3 render_server.py serve --port 8765
+    python3 render_server.py fetch FT1001 --layout full -o drill.pdf
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from manual_catalog import CATALOG_FILE, DEFAULT_LOCALE, CatalogError, load_catalog, localize
+from manual_parser import parse_manual
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+LAYOUT_MODES = ('condensed', 'full')
+
+# ReportLab keeps module-level state (font caches, rl_config), so renders are
+# serialized; health checks and catalog listings are still answered meanwhile.
+_RENDER_LOCK = threading.Lock()
+
+# The loaded catalog and the (mtime, size) of the file it was loaded from
+_CATALOG = None
+_CATALOG_SIGNATURE = None
+_CATALOG_LOCK = threading.Lock()
+
+
+class RenderError(Exception):
+    """A render request that cannot be served; carries the HTTP status."""
+
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+def catalog(path=CATALOG_FILE):
+    """The manual catalog, loaded once and reloaded only when the file changes.
+
+    A missing catalog is a RenderError 404, an unreadable or malformed one a 500.
+    """
+    global _CATALOG, _CATALOG_SIGNATURE
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise RenderError(404, f"no manual catalog: {os.path.basename(path)}") from None
+    except OSError as e:
+        raise RenderError(500, f"cannot read catalog {os.path.basename(path)}: {e.strerror}") from None
+    signature = (st.st_mtime_ns, st.st_size)
+    with _CATALOG_LOCK:
+        if _CATALOG is None or signature != _CATALOG_SIGNATURE:
+            try:
+                _CATALOG = load_catalog(path)
+            except CatalogError as e:
+                raise RenderError(500, str(e)) from None
+            _CATALOG_SIGNATURE = signature
+        return _CATALOG
+
+
+def find_manual(model):
+    return catalog().get(model)
+
+
+def render_pdf(tree, model, title):
+    """Render a parsed manual to PDF bytes without touching the filesystem."""
+    from manual_pdf import FreedomManualPDF
+    pdf = FreedomManualPDF(None, model, title)
+    pdf.add_cover_page(title, model)
+    pdf.add_manual(tree)
+    with _RENDER_LOCK:
+        return pdf.build_bytes()
+
+
+def render_catalog_pdf(manual):
+    """Render a catalog entry exactly as generate_professional_pdfs.py builds it."""
+    from generate_professional_pdfs import catalog_manual_pdf
+    # Fitting to target_pages lays the manual out too, so it is serialized as well
+    with _RENDER_LOCK:
+        try:
+            pdf = catalog_manual_pdf(manual)
+        except OSError as e:
+            missing = os.path.basename(e.filename or manual['text_file'])
+            raise RenderError(404, f"a source file of {manual['model']} is unavailable: "
+                                   f"{missing} ({e.strerror or e})")
+        return pdf.build_bytes()
+
+
+def render_request(payload):
+    """Resolve a /render JSON payload and return the PDF bytes."""
+    if not isinstance(payload, dict):
+        raise RenderError(400, "request body must be a JSON object")
+    layout = payload.get('layout', 'condensed')
+    if layout not in LAYOUT_MODES:
+        raise RenderError(400, f"layout must be one of {', '.join(LAYOUT_MODES)}")
+    model = payload.get('model', '')
+    if not isinstance(model, str):
+        raise RenderError(400, "model must be a string")
+    if not isinstance(payload.get('title', ''), str):
+        raise RenderError(400, "title must be a string")
+    if not isinstance(payload.get('locale', ''), str):
+        raise RenderError(400, "locale must be a string")
+
+    if 'text' in payload:
+        if not isinstance(payload['text'], str):
+            raise RenderError(400, "text must be a string")
+        try:
+            manual = find_manual(model)
+        except RenderError:
+            # Supplied text renders without a catalog; it only lends the title
+            manual = None
+        title = payload.get('title') or (manual['title'] if manual else model)
+        tree = parse_manual(payload['text'])
+    else:
+        manual = find_manual(model)
+        if manual is None:
+            raise RenderError(404, f"unknown model: {model!r}")
+        locale = payload.get('locale') or DEFAULT_LOCALE
+        try:
+            manual = localize(manual, locale)
+        except CatalogError as e:
+            raise RenderError(404, str(e))
+        if payload.get('title'):
+            manual = dict(manual, title=payload['title'])
+        if layout == 'full':
+            # The page target is the condensed layout's; the full rewrite is not fitted
+            manual = dict(manual, text_file=manual['full_text_file'], target_pages=None)
+        return render_catalog_pdf(manual)
+    return render_pdf(tree, model, title)
+
+
+def warm_up():
+    """Pay the one-off style, font-metric and layout setup before serving."""
+    # The fetch client never renders, so ReportLab is only loaded here
+    from manual_pdf import get_stylesheet
+    get_stylesheet()
+    render_pdf(parse_manual("WARM UP\n-------\nReady."), 'FT0000', 'Warm up')
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = 'FreedomRender/1.0'
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, b'ok', 'text/plain; charset=utf-8')
+        elif self.path == '/manuals':
+            try:
+                listing = [{'model': m['model'], 'title': m['title']} for m in catalog()]
+            except RenderError as e:
+                self._send_json(e.status, {'error': str(e)})
+                return
+            self._send_json(200, listing)
+        else:
+            self._send_json(404, {'error': f"no such endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/render':
+            self._send_json(404, {'error': f"no such endpoint: {self.path}"})
+            return
+        start = time.perf_counter()
+        try:
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+            except ValueError:
+                raise RenderError(400, "Content-Length must be an integer")
+            if length < 0:
+                raise RenderError(400, "Content-Length must not be negative")
+            try:
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                raise RenderError(400, "request body is not valid JSON")
+            pdf_bytes = render_request(payload)
+        except RenderError as e:
+            self._send_json(e.status, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, pdf_bytes, 'application/pdf',
+                   {'X-Render-Seconds': f"{time.perf_counter() - start:.4f}"})
+
+    def _send_json(self, status, obj):
+        self._send(status, json.dumps(obj).encode('utf-8'), 'application/json')
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[render] {self.address_string()} {format % args}\n")
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Create (but do not start) a warmed-up render server."""
+    warm_up()
+    return ThreadingHTTPServer((host, port), RenderHandler)
+
+
+def fetch_pdf(model=None, text=None, title=None, layout='condensed', locale=None,
+              host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=60):
+    """Client helper: ask a running render server for a PDF and return its bytes."""
+    payload = {'layout': layout}
+    if model:
+        payload['model'] = model
+    if text is not None:
+        payload['text'] = text
+    if title:
+        payload['title'] = title
+    if locale:
+        payload['locale'] = locale
+    request = urllib.request.Request(
+        f"http://{host}:{port}/render",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read()
+    except urllib.error.HTTPError as e:
+        detail = e.read().decode('utf-8', 'replace')
+        raise RenderError(e.code, detail) from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Freedom Tools manual render server.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help="run the render server")
+    serve.add_argument('--host', default=DEFAULT_HOST)
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+
+    fetch = sub.add_parser('fetch', help="request a PDF from a running server")
+    fetch.add_argument('model', help="model ID, e.g. FT1001")
+    fetch.add_argument('--text-file', help="render this manual text instead of the catalog source")
+    fetch.add_argument('--title')
+    fetch.add_argument('--layout', choices=LAYOUT_MODES, default='condensed')
+    fetch.add_argument('--locale', help="a translated edition of the catalog manual, e.g. es")
+    fetch.add_argument('--host', default=DEFAULT_HOST)
+    fetch.add_argument('--port', type=int, default=DEFAULT_PORT)
+    fetch.add_argument('-o', '--output', required=True, help="where to write the PDF")
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        server = make_server(args.host, args.port)
+        print(f"Render server listening on http://{args.host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    text = None
+    if args.text_file:
+        text = Path(args.text_file).read_text(encoding='utf-8')
+    try:
+        pdf_bytes = fetch_pdf(args.model, text=text, title=args.title, layout=args.layout,
+                              locale=args.locale, host=args.host, port=args.port)
+    except RenderError as e:
+        print(f"✗ Render failed ({e.status}): {e}", file=sys.stderr)
+        return 1
+    except urllib.error.URLError as e:
+        print(f"✗ Cannot reach render server at {args.host}:{args.port}: {e.reason}", file=sys.stderr)
+        return 1
+    Path(args.output).write_bytes(pdf_bytes)
+    print(f"✓ PDF written: {args.output} ({len(pdf_bytes)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())